@@ -0,0 +1,5 @@
+"""Benchmarks of the package hot paths.
+
+Each module can be run on its own from the "source" directory, e.g. "python -m benchmarks.logger_latency".
+"python -m benchmarks" runs the micro-benchmark suite and compares the results against the stored baseline.
+"""
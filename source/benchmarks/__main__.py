@@ -0,0 +1,106 @@
+"""Runs the micro-benchmark suite, writes results as JSON and compares them against a stored baseline.
+
+Usage: python -m benchmarks [-o RESULTS] [-b BASELINE] [-t TOLERANCE] [-k PATTERN] [--update-baseline]
+
+The script exits with a non-zero code if any case is slower than the baseline by more than the tolerance.
+Baseline numbers depend on the machine, they should be updated when the suite is run somewhere else.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.suite import CASES
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+# Minimum duration of a single timed repetition and a number of repetitions.
+REPETITION_TIME = 0.05
+REPETITIONS = 5
+
+
+def _time_case(function) -> float:
+    """Returns the best time of a single call in nanoseconds.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        if time.perf_counter() - start >= REPETITION_TIME:
+            break
+        loops *= 2
+    best = None
+    for _ in range(REPETITIONS):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            function()
+        elapsed = (time.perf_counter_ns() - start) / loops
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(pattern: str = None) -> dict:
+    """Runs the cases whose names contain the pattern, returns the results in nanoseconds per call.
+    """
+    results = {}
+    for name, case in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        with case() as function:
+            results[name] = round(_time_case(function), 1)
+        print(f"{name:<34} {results[name] / 1000:12.3f}us", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Returns names of the cases slower than the baseline by more than the tolerance.
+    """
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        ratio = value / baseline[name]
+        status = 'REGRESSION' if ratio > 1 + tolerance else 'ok'
+        print(f"{name:<34} {ratio:6.2f}x baseline  {status}")
+        if status != 'ok':
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-o', '--output', help='A path of the JSON file the results are written to.')
+    parser.add_argument('-b', '--baseline', default=BASELINE_PATH, type=Path, help='A path of the baseline file.')
+    parser.add_argument('-t', '--tolerance', default=0.3, type=float,
+                        help='An accepted slowdown against the baseline, 0.3 means 30%%.')
+    parser.add_argument('-k', '--filter', help='Runs only the cases whose names contain given string.')
+    parser.add_argument('--update-baseline', action='store_true', help='Stores the results as the new baseline.')
+    params = parser.parse_args()
+    document = {'python': platform.python_version(),
+                'platform': platform.platform(),
+                'unit': 'ns per call',
+                'results': run(params.filter)}
+    if params.output:
+        Path(params.output).write_text(json.dumps(document, indent=4) + '\n')
+    if params.update_baseline:
+        if params.baseline.exists():
+            baseline = json.loads(params.baseline.read_text())
+            document['results'] = {**baseline['results'], **document['results']}
+        params.baseline.write_text(json.dumps(document, indent=4) + '\n')
+        print(f"Baseline stored in {params.baseline}.")
+        return
+    if not params.baseline.exists():
+        print(f"No baseline in {params.baseline}, run with --update-baseline to store one.")
+        return
+    regressions = compare(document['results'], json.loads(params.baseline.read_text())['results'], params.tolerance)
+    if regressions:
+        print(f"FAILED: {len(regressions)} case(s) slower than the baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Peak RSS and time of reading a large @file argument file: the streaming reader against argparse.
+
+Each reader runs in a separate process, so its peak RSS isn't affected by the other one.
+
+Usage: python -m benchmarks.arg_file [VALUES]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+VALUES = 5000000
+
+_STREAMING = '''
+import resource, sys, time
+from template_package.config.command_line_parser import CommandLineParser
+start = time.perf_counter()
+parser = CommandLineParser(['@' + sys.argv[1]])
+parser.parse()
+values = parser.params.common_list_param
+parsed = time.perf_counter() - start
+count = sum(1 for _ in values)
+print(parsed, time.perf_counter() - start, count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+_ARGPARSE = '''
+import argparse, resource, sys, time
+from template_package.config.command_line_parser import CommandLineParser
+start = time.perf_counter()
+parser = CommandLineParser(['@' + sys.argv[1]])
+parser.prepare_parser()
+values = parser._parser.parse_args(['@' + sys.argv[1]]).common_list_param
+parsed = time.perf_counter() - start
+count = sum(1 for _ in values)
+print(parsed, time.perf_counter() - start, count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def _run(code: str, path: str) -> str:
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, '-c', code, path], capture_output=True, text=True, check=True,
+                            env=environment).stdout
+    parsed, total, count, max_rss = output.split()
+    return (f"parse={float(parsed) * 1000:8.1f}ms  parse+iterate={float(total) * 1000:8.1f}ms  "
+            f"values={count}  peak RSS={int(max_rss) / 1024:7.1f}MiB")
+
+
+def main():
+    values = int(sys.argv[1]) if len(sys.argv) > 1 else VALUES
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'arguments.txt')
+        with open(path, 'w') as file:
+            file.write('-l\nINFO\nmode-b\n-ci\n1\n-cl\n')
+            for start in range(0, values, 100000):
+                file.write(''.join(f'{i}\n' for i in range(start, min(start + 100000, values))))
+        print(f"argument file: {os.path.getsize(path) / 2 ** 20:.1f}MiB")
+        print(f"{'streaming':<10} {_run(_STREAMING, path)}")
+        print(f"{'argparse':<10} {_run(_ARGPARSE, path)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Attribute read cost and per-instance memory of the slotted Args record against the former dict-based one.
+"""
+
+import logging
+import sys
+import timeit
+import tracemalloc
+from abc import ABC
+
+from template_package.config.args import Args
+from template_package.config.notset import NotSetError
+
+READS = 1000000
+INSTANCES = 10000
+PARSED_ARGS = {'log_level': 'INFO', 'log_mode': 'w', 'log_async': 'off', 'log_queue_size': 10000,
+               'basic_param': 'basic_param_default_value', 'mode': 'mode-a', 'common_int_param': 123,
+               'common_list_param': ['first', '54'], 'a_mode_only_param': 'value'}
+
+
+class _LegacyArg(ABC):
+
+    def __init__(self, value):
+        self._value = value
+
+
+class _LegacyStr(_LegacyArg, str):
+    pass
+
+
+class _LegacyInt(_LegacyArg, int):
+    pass
+
+
+class _LegacyList(_LegacyArg, list):
+
+    def __init__(self, value):
+        _LegacyArg.__init__(self, value)
+        list.__init__(self, value)
+
+
+class _LegacyArgs(dict):
+    """The former implementation: a dict of Arg instances read through properties.
+    """
+
+    def set_args(self, parsed_args):
+        for dest, value in parsed_args.items():
+            arg = {int: _LegacyInt, list: _LegacyList}.get(type(value), _LegacyStr)
+            self.__setitem__(dest, arg(value))
+
+    @property
+    def common_int_param(self):
+        try:
+            return self.__getitem__('common_int_param')
+        except KeyError:
+            raise NotSetError("common_int_param hasn't been set")
+
+
+def _read_time(args, reads: int) -> float:
+    """Returns an average read time in nanoseconds.
+    """
+    return timeit.timeit('args.common_int_param', globals={'args': args}, number=reads) / reads * 1e9
+
+
+def _instance_memory(args_class, instances: int) -> float:
+    """Returns an average memory in bytes taken by a record with its values.
+    """
+    tracemalloc.start()
+    records = []
+    for _ in range(instances):
+        args = args_class()
+        args.set_args(PARSED_ARGS)
+        records.append(args)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory / instances
+
+
+def main():
+    logging.disable(logging.DEBUG)
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else READS
+    for name, args_class in [('dict-based', _LegacyArgs), ('slotted', Args)]:
+        args = args_class()
+        args.set_args(PARSED_ARGS)
+        print(f"{name:<12} read: {_read_time(args, reads):6.1f}ns   "
+              f"memory per instance: {_instance_memory(args_class, INSTANCES):7.0f}B")
+
+
+if __name__ == '__main__':
+    main()
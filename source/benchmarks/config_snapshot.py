@@ -0,0 +1,73 @@
+"""Time of resolving arguments and of the whole script configuration with imports, in a fresh process:
+parsing the input against loading a snapshot of resolved arguments.
+
+Each run is a separate process, as a recurring job would be, so nothing is shared between them. It runs
+in a temporary directory, which holds the log files, the argument file and the configuration file.
+
+Usage: python -m benchmarks.config_snapshot [RUNS]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 20
+
+_CONFIGURE = '''
+import sys, time
+start = time.perf_counter()
+from template_package.config.config import Config
+from template_package.lib.tracing import tracer
+tracer.enable()
+config = Config(sys.argv[1:])
+elapsed = time.perf_counter() - start
+config.close()
+print(elapsed, tracer.summary()['config.resolve'][1])
+'''
+
+# Fast parser input, argparse fallback input (an abbreviated option) and input read from files.
+COMMAND_LINES = {
+    'fast parser': ['mode-b', '-ci', '1', '-cl', 'a', 'b', 'c'],
+    'argparse': ['--log-lev', 'INFO', 'mode-b', '-ci', '1', '-cl', 'a', 'b', 'c'],
+    'config file, @file': ['-cf', '{directory}/config.ini', 'mode-b', '@{directory}/arguments.txt', '-cl', 'a'],
+}
+
+
+def _configure_times(argv: list, environment: dict, directory: str) -> tuple:
+    """Returns time of imports and the configuration, and time of resolving the arguments alone.
+    """
+    output = subprocess.run([sys.executable, '-c', _CONFIGURE, *argv], capture_output=True, text=True, check=True,
+                            env=environment, cwd=directory).stdout
+    # Log records are printed to the standard output before the times.
+    total, resolve = output.splitlines()[-1].split()
+    return float(total), float(resolve)
+
+
+def _medians(argv: list, environment: dict, directory: str, runs: int) -> tuple:
+    times = [_configure_times(argv, environment, directory) for _ in range(runs)]
+    return tuple(statistics.median(column) for column in zip(*times))
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'config.ini'), 'w') as file:
+            file.write('[BASIC]\nlog-level = INFO\nworkers = 2\n')
+        with open(os.path.join(directory, 'arguments.txt'), 'w') as file:
+            # List values kept in an argument file are read lazily, such arguments aren't stored in snapshots.
+            file.write('-ci\n1\n')
+        for name, argv in COMMAND_LINES.items():
+            argv = [token.format(directory=directory) for token in argv]
+            environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+            parsed = _medians(argv, environment, directory, runs)
+            environment['TEMPLATE_PACKAGE_CONFIG_CACHE'] = os.path.join(directory, 'cache')
+            _configure_times(argv, environment, directory)
+            loaded = _medians(argv, environment, directory, runs)
+            print(f"{name:<20} resolve: parsed={parsed[1] * 1000:6.2f}ms snapshot={loaded[1] * 1000:6.2f}ms  "
+                  f"imports+config: parsed={parsed[0] * 1000:6.2f}ms snapshot={loaded[0] * 1000:6.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Differential check and timing of the fast command line parser against the argparse parser.
+
+The fast parser has to return exactly the same values as argparse or give up (return None).
+The script exits with a non-zero code if any case of the corpus differs.
+"""
+
+import contextlib
+import io
+import random
+import sys
+import timeit
+
+from template_package.config.command_line_parser import CommandLineParser
+
+REPEAT = 200
+RANDOM_CASES = 5000
+
+CORPUS = [
+    [],
+    ['mode-a'],
+    ['mode-b'],
+    ['-l', 'DEBUG', 'mode-a', '-a', 'value', '-ci', '123', '-cl', 'first', '54'],
+    ['--log-level', 'ERROR', '--log-mode', 'a', 'mode-b', '--common-list-param', 'x', 'y', 'z'],
+    ['--log-level=WARNING', '-m=w', 'mode-a', '-ci=7', '-cl=one'],
+    ['-b', 'mode-a', 'mode-b', '-cl', 'q'],
+    ['-b', '', 'mode-a'],
+    ['-la', 'drop-new', '-lq', '5', 'mode-a', '-a', 'mode-b'],
+    ['mode-a', '-cl', 'a', '-cl', 'b', 'c', '-ci', '1', '-ci', '2'],
+    ['-l', 'DEBUG', '-l', 'INFO'],
+    ['-h'],
+    ['-v'],
+    ['mode-a', '-h'],
+    ['-l', 'TRACE', 'mode-a'],
+    ['-lDEBUG', 'mode-a'],
+    ['--log-lev', 'DEBUG', 'mode-a'],
+    ['mode-a', '-ci', '-5'],
+    ['mode-a', '-ci', 'x'],
+    ['mode-a', '-ci'],
+    ['mode-a', '-cl'],
+    ['mode-a', '-cl', 'a', 'mode-b'],
+    ['mode-b', '-a', 'value'],
+    ['mode-a', '-l', 'DEBUG'],
+    ['mode-c'],
+    ['-b', '-', 'mode-a'],
+    ['mode-a', '-cl', '-', 'x'],
+    ['mode-a', '--', '-cl', 'x'],
+    ['@missing_file'],
+    ['mode-a', '-a', '@value'],
+    ['-lq', '10', '-lq', '010', 'mode-b', '-ci', ' 3 '],
+    ['--log-queue-size=', 'mode-b'],
+    ['-b=x=y', 'mode-a', '--a-mode-only-param=1=2'],
+]
+
+TOKENS = ['-l', '--log-level', 'DEBUG', 'INFO', 'BAD', '-m', 'w', 'a', '-la', 'block', 'off', '-lq', '3', '-x',
+          '-b', 'value', 'mode-a', 'mode-b', '-a', '-ci', '12', '-1', '-cl', 'e1', 'e2', '--common-list-param=e3',
+          '-ci=4', '--log-mode=a', '--', '-', '', '-h']
+
+
+def _argparse_parse(argv: list):
+    """Returns argparse result as items of the namespace, or None on error, help or unknown arguments.
+    """
+    parser = CommandLineParser(argv)
+    parser.prepare_parser()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            params, unknown_args = parser._parser.parse_known_args(argv)
+    except SystemExit:
+        return None
+    return None if unknown_args else list(params.__dict__.items())
+
+
+class _ArgparseOnlyParser(CommandLineParser):
+    """A command line parser which always falls back to argparse.
+    """
+
+    class _NoFastPath:
+
+        def __init__(self, fast_parser):
+            self.initial_values = fast_parser.initial_values
+            self.take_list_sources = fast_parser.take_list_sources
+
+        @staticmethod
+        def parse_explicit(argv):
+            return None
+
+    @classmethod
+    def _get_fast_parser(cls):
+        return cls._NoFastPath(CommandLineParser._get_fast_parser())
+
+
+def _fallback_parse(argv: list) -> list:
+    """Returns items of params of the command line parser using argparse with defaults applied afterwards.
+    """
+    parser = _ArgparseOnlyParser(argv)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        parser.parse()
+    return list(parser.params.__dict__.items())
+
+
+def _corpus() -> list:
+    generator = random.Random(0)
+    random_cases = [[generator.choice(TOKENS) for _ in range(generator.randint(0, 8))] for _ in range(RANDOM_CASES)]
+    return CORPUS + random_cases
+
+
+def check() -> int:
+    """Runs the differential check, returns a number of failed cases.
+    """
+    fast_parser = CommandLineParser._get_fast_parser()
+    corpus = _corpus()
+    failures = 0
+    handled = 0
+    for argv in corpus:
+        expected = _argparse_parse(argv)
+        if expected is not None and _fallback_parse(argv) != expected:
+            failures += 1
+            print(f"MISMATCH {argv}: argparse fallback={_fallback_parse(argv)} argparse={expected}")
+        fast_params = fast_parser.parse(argv)
+        if fast_params is None:
+            continue
+        handled += 1
+        if list(fast_params.__dict__.items()) != expected:
+            failures += 1
+            print(f"MISMATCH {argv}: fast={fast_params.__dict__} argparse={expected}")
+    print(f"cases={len(corpus)} handled by the fast parser={handled} mismatches={failures}")
+    return failures
+
+
+def _time(argv: list, repeat: int):
+    def argparse_run():
+        parser = CommandLineParser(argv)
+        parser.prepare_parser()
+        parser._parser.parse_known_args(argv)
+
+    def fast_run():
+        CommandLineParser(argv).parse()
+
+    argparse_time = timeit.timeit(argparse_run, number=repeat) / repeat * 1000
+    fast_time = timeit.timeit(fast_run, number=repeat) / repeat * 1000
+    print(f"argparse: {argparse_time:7.3f}ms   fast path: {fast_time:7.3f}ms   argv={argv}")
+
+
+def main():
+    failures = check()
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT
+    _time(CORPUS[3], repeat)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Cold import time and module count regression check, based on "python -X importtime".
+
+The script exits with a non-zero code if importing the package entry point goes over the budget
+or pulls in a module which should be loaded only on first use.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+MODULE = 'template_package.__main__'
+RUNS = 7
+# Budgets for modules imported on top of bare interpreter startup.
+MODULE_COUNT_BUDGET = 10
+IMPORT_TIME_BUDGET_US = 15000
+DEFERRED_MODULES = ['argparse', 'asyncio', 'cProfile', 'json', 'logging', 'logging.handlers', 'pathlib', 're',
+                    'tracemalloc', 'typing',
+                    'template_package.config.config', 'template_package.config.command_line_parser',
+                    'template_package.lib.logger', 'template_package.modes.mode_a', 'template_package.modes.mode_b']
+
+
+def _import_times(statement: str) -> dict:
+    """Returns cumulative import times in microseconds keyed by module name.
+    """
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            cwd=source_dir, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    baseline = _import_times('pass')
+    measurements = [_import_times(f'import {MODULE}') for _ in range(RUNS)]
+    modules = measurements[0].keys() - baseline.keys()
+    import_time = statistics.median(m[MODULE] for m in measurements)
+    print(f"modules imported={len(modules)} (budget {MODULE_COUNT_BUDGET}), "
+          f"import time={import_time:.0f}us (budget {IMPORT_TIME_BUDGET_US}us)")
+    failures = []
+    if len(modules) > MODULE_COUNT_BUDGET:
+        failures.append(f"module count over budget: {sorted(modules)}")
+    if import_time > IMPORT_TIME_BUDGET_US:
+        failures.append('import time over budget')
+    eager = sorted(modules & set(DEFERRED_MODULES))
+    if eager:
+        failures.append(f"modules which should be deferred were imported: {eager}")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
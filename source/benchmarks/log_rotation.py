@@ -0,0 +1,55 @@
+"""Rotation by time of a log file appended to by repeated short runs, each shorter than the rotation period.
+
+Each run opens the file, writes a few records and closes it. Between runs the file is made older
+by the given period, as if the runs were that far apart, so every run after the first one should rotate it.
+The script exits with a non-zero code if the number of rotated segments is different.
+
+Usage: python -m benchmarks.log_rotation [RUNS]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from template_package.config.constants import DEBUG_FORMAT, DATE_FORMAT
+from template_package.lib.log_handlers import WHEN_INTERVALS, RotatingFileHandler
+
+RUNS = 20
+RECORDS = 100
+WHEN = 'H'
+
+
+def _run(path: str, records: int) -> float:
+    """Appends records to the file as a single short run, returns its duration in seconds.
+    """
+    start = time.perf_counter()
+    handler = RotatingFileHandler(path, 'a', when=WHEN, compress=False)
+    handler.setFormatter(logging.Formatter(DEBUG_FORMAT, DATE_FORMAT))
+    for i in range(records):
+        handler.handle(logging.LogRecord('benchmark', logging.INFO, __file__, 0, 'Run record %s.', (i,), None))
+    handler.close()
+    return time.perf_counter() - start
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'benchmark.log')
+        durations = []
+        for _ in range(runs):
+            durations.append(_run(path, RECORDS))
+            modified = os.stat(path).st_mtime - WHEN_INTERVALS[WHEN]
+            os.utime(path, (modified, modified))
+        handler = RotatingFileHandler(path, 'a')
+        segments = len(handler.segments())
+        handler.close()
+    print(f"{runs} runs, {segments} rotated segments, mean run {sum(durations) / runs * 1000:.2f}ms")
+    if segments != runs - 1:
+        print(f"FAILED: {runs - 1} rotated segments expected.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
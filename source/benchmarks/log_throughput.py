@@ -0,0 +1,57 @@
+"""Throughput of log file handlers: the standard FileHandler writing and flushing every record
+against BufferedFileHandler with several flush policies.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from template_package.config.constants import DEBUG_FORMAT, DATE_FORMAT
+from template_package.lib.log_handlers import BufferedFileHandler
+
+RECORDS = 100000
+
+POLICIES = {
+    'FileHandler': None,
+    'buffered 64KiB': {'buffer_bytes': 65536},
+    'buffered 64KiB/1000': {'buffer_bytes': 65536, 'buffer_records': 1000, 'flush_interval': 1.0},
+    'buffered fsync=interval': {'buffer_bytes': 65536, 'flush_interval': 1.0, 'fsync': 'interval'},
+    'buffered fsync=always': {'buffer_bytes': 65536, 'fsync': 'always'},
+}
+
+
+def _measure(handler: logging.Handler, records: int) -> float:
+    """Returns a number of records written per second through a logger with only the given handler.
+    """
+    handler.setFormatter(logging.Formatter(DEBUG_FORMAT, DATE_FORMAT))
+    log = logging.getLogger('benchmark.log_throughput')
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log.addHandler(handler)
+    try:
+        start = time.perf_counter()
+        for i in range(records):
+            log.debug('Benchmark record number %s with some payload: %s.', i, 'x' * 40)
+        handler.close()
+        return records / (time.perf_counter() - start)
+    finally:
+        log.removeHandler(handler)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = None
+        for name, policy in POLICIES.items():
+            path = os.path.join(directory, 'benchmark.log')
+            handler = logging.FileHandler(path, 'w') if policy is None else BufferedFileHandler(path, 'w', **policy)
+            throughput = _measure(handler, records)
+            baseline = baseline or throughput
+            print(f"{name:<26} {throughput:12,.0f} records/s  x{throughput / baseline:5.2f}  "
+                  f"file={os.path.getsize(path)} B")
+
+
+if __name__ == '__main__':
+    main()
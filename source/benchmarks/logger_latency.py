@@ -0,0 +1,54 @@
+"""Per-call latency of logging calls with synchronous and asynchronous (queue based) sinks.
+"""
+
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from template_package.lib.logger import Logger
+
+CALLS = 20000
+
+
+def _measure(logger: Logger, calls: int) -> list:
+    """Returns per-call latencies of logging.info in nanoseconds.
+    """
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        logging.info('Benchmark record number %s with some payload: %s.', i, 'x' * 40)
+        latencies.append(time.perf_counter_ns() - start)
+    logger.close()
+    return latencies
+
+
+def _configured_logger(directory: str) -> Logger:
+    logger = Logger()
+    logger.set_level('INFO')
+    logger.config_log_file_handler(Path(directory, 'benchmark.log'))
+    logger.config_debug_log_file_handler(Path(directory, 'benchmark_debug.log'))
+    return logger
+
+
+def _report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    print(f"{name:<24} mean={statistics.fmean(latencies) / 1000:8.2f}us "
+          f"p50={latencies[len(latencies) // 2] / 1000:8.2f}us "
+          f"p99={latencies[int(len(latencies) * 0.99)] / 1000:8.2f}us")
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else CALLS
+    with tempfile.TemporaryDirectory() as directory:
+        _report('sync', _measure(_configured_logger(directory), calls))
+        for policy in ['block', 'drop-new']:
+            logger = _configured_logger(directory)
+            logger.enable_async(queue_size=calls, policy=policy)
+            _report(f'async ({policy})', _measure(logger, calls))
+
+
+if __name__ == '__main__':
+    main()
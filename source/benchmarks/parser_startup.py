@@ -0,0 +1,60 @@
+"""Parser construction time against a number of registered modes, building all modes against the selected one only.
+"""
+
+import argparse
+import sys
+import timeit
+
+from template_package.config.command_line_parser import CommandLineParser
+from template_package.config.mode import Mode
+
+MODE_COUNTS = [2, 10, 50, 100]
+REPEAT = 50
+
+
+def _parser_class(mode_count: int, eager: bool):
+    """Creates a parser class with given number of registered modes.
+    """
+
+    def prepare_mode_parser(name):
+        def prepare(parser):
+            mode_parser = parser._subparsers.add_parser(name,
+                                                        description=f'{name}.',
+                                                        formatter_class=argparse.RawTextHelpFormatter,
+                                                        help=f'Set a script mode to {name}.',
+                                                        parents=[parser._common_parser],
+                                                        add_help=False)
+            argument_group = mode_parser.add_argument_group(name, f'Parameters specific for {name}.')
+            argument_group.add_argument(f'--{name}-param', help=f'Set a parameter specific for {name}.')
+        return prepare
+
+    mode_parsers = dict(CommandLineParser._mode_parsers)
+    for i in range(len(mode_parsers), mode_count):
+        mode_parsers[f'mode-{i}'] = prepare_mode_parser(f'mode-{i}')
+    attributes = {'_mode_parsers': mode_parsers}
+    if eager:
+        attributes['_selected_mode'] = lambda self: None
+    return type('BenchmarkParser', (CommandLineParser,), attributes)
+
+
+def _time(parser_class, argv: list, repeat: int) -> float:
+    """Returns an average time of parser construction and parsing in milliseconds.
+    """
+    def run():
+        parser = parser_class(argv)
+        parser.prepare_parser()
+        parser._parser.parse_known_args(argv)
+    return timeit.timeit(run, number=repeat) / repeat * 1000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT
+    argv = ['-l', 'INFO', Mode.MODE_A, '-a', 'value', '-ci', '1', '-cl', 'x', 'y']
+    for mode_count in MODE_COUNTS:
+        eager = _time(_parser_class(mode_count, eager=True), argv, repeat)
+        lazy = _time(_parser_class(mode_count, eager=False), argv, repeat)
+        print(f"modes={mode_count:<4} all modes built: {eager:7.3f}ms   selected mode only: {lazy:7.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
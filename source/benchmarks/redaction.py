@@ -0,0 +1,62 @@
+"""Throughput of sensitive data redaction: stacked per-secret formatter proxies against the compiled registry.
+"""
+
+import logging
+import re
+import sys
+import timeit
+
+from template_package.config.constants import BASIC_FORMAT, DATE_FORMAT
+from template_package.lib.logger import _HiddenSensitiveDataFormatter
+from template_package.lib.redaction import SensitiveDataRegistry
+
+RECORDS = 20000
+SECRET_COUNTS = [1, 10, 100]
+
+
+class _LegacyProxy(logging.Formatter):
+    """The former implementation, one proxy and one regex pass per registered secret.
+    """
+
+    def __init__(self, formatter, sensitive_patterns):
+        super().__init__()
+        self._formatter = formatter
+        self._patterns = [re.compile(pattern) for pattern in sensitive_patterns]
+
+    def format(self, record):
+        log_msg = self._formatter.format(record)
+        for pattern in self._patterns:
+            log_msg = pattern.sub("*" * 5, log_msg)
+        return log_msg
+
+
+def _record(secret: str) -> logging.LogRecord:
+    return logging.LogRecord('benchmark', logging.INFO, __file__, 0,
+                             'Connecting to db host=%s user=%s password=%s.', ('db.local', 'admin', secret), None)
+
+
+def _throughput(formatter: logging.Formatter, record: logging.LogRecord, records: int) -> float:
+    """Returns formatted records per second.
+    """
+    return records / timeit.timeit(lambda: formatter.format(record), number=records)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    for count in SECRET_COUNTS:
+        secrets = [f"secret-{i}-pass" for i in range(count)]
+        record = _record(secrets[-1])
+        legacy = logging.Formatter(BASIC_FORMAT, DATE_FORMAT)
+        for secret in secrets:
+            legacy = _LegacyProxy(legacy, [secret])
+        registry = SensitiveDataRegistry()
+        for secret in secrets:
+            registry.add_literal(secret)
+        compiled = _HiddenSensitiveDataFormatter(BASIC_FORMAT, DATE_FORMAT, registry=registry)
+        assert legacy.format(record) == compiled.format(record)
+        print(f"secrets={count:<4} stacked proxies: {_throughput(legacy, record, records):10.0f} rec/s   "
+              f"compiled registry: {_throughput(compiled, record, records):10.0f} rec/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Peak RSS and time of iterating over list values streamed from the standard input ("-cl @-") in batches,
+at growing numbers of values. Peak RSS should stay the same.
+
+Each run is a separate process fed by a generator of values, so its peak RSS isn't affected by the others.
+
+Usage: python -m benchmarks.stream_values [VALUES ...]
+"""
+
+import os
+import subprocess
+import sys
+
+VALUES = [100000, 1000000, 5000000]
+
+BATCH_SIZE = 1000
+
+_STREAMING = f'''
+import resource, time
+from template_package.config.command_line_parser import CommandLineParser
+start = time.perf_counter()
+parser = CommandLineParser(['mode-b', '-ci', '1', '-cl', '@-'])
+parser.parse()
+count = sum(len(batch) for batch in parser.params.common_list_param.batches({BATCH_SIZE}))
+print(time.perf_counter() - start, count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+_FEEDER = '''
+import sys
+for start in range(0, int(sys.argv[1]), 100000):
+    sys.stdout.write(''.join(f'{i}\\n' for i in range(start, min(start + 100000, int(sys.argv[1])))))
+'''
+
+
+def _run(values: int) -> str:
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    feeder = subprocess.Popen([sys.executable, '-c', _FEEDER, str(values)], stdout=subprocess.PIPE)
+    try:
+        output = subprocess.run([sys.executable, '-c', _STREAMING], stdin=feeder.stdout, capture_output=True,
+                                text=True, check=True, env=environment).stdout
+    finally:
+        feeder.stdout.close()
+        feeder.wait()
+    elapsed, count, max_rss = output.split()
+    return f"time={float(elapsed) * 1000:8.1f}ms  values={count}  peak RSS={int(max_rss) / 1024:7.1f}MiB"
+
+
+def main():
+    for values in [int(value) for value in sys.argv[1:]] or VALUES:
+        print(f"{values:>10} {_run(values)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""Micro-benchmark cases of the package hot paths, run by "python -m benchmarks".
+
+A case is a context manager yielding a callable to be timed; set up and clean up happen around it.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from template_package.config.args import Args
+from template_package.config.command_line_parser import CommandLineParser
+from template_package.config.constants import BASIC_FORMAT, DATE_FORMAT, DEBUG_FORMAT
+from template_package.lib.custom_types import TupleType
+from template_package.lib.lazy import LazyJson
+from template_package.lib.logger import _DEBUG_JSON_FIELDS, Logger, _HiddenSensitiveDataFormatter, _JsonFormatter
+from template_package.lib.metrics import MetricsRegistry
+from template_package.lib.redaction import SensitiveDataRegistry
+from template_package.lib.tracing import span, tracer
+from template_package.lib.utilities import iterable_to_string
+
+ARGV = ['-l', 'DEBUG', 'mode-a', '-a', 'value', '-ci', '123', '-cl', 'first', '54']
+# An abbreviated option isn't handled by the fast parser, so argparse is used.
+ARGPARSE_ARGV = ['--log-l', 'DEBUG', 'mode-a', '-a', 'value', '-ci', '123', '-cl', 'first', '54']
+
+CASES = {}
+
+# Keeps logging calls made by the package from installing a default stderr handler on the root logger.
+logging.getLogger().addHandler(logging.NullHandler())
+
+
+def case(name: str):
+    """Registers a benchmark case under given name.
+    """
+    def register(function):
+        CASES[name] = contextlib.contextmanager(function)
+        return function
+    return register
+
+
+@case('parser.prepare_parser')
+def _prepare_parser():
+    yield lambda: CommandLineParser(ARGV).prepare_parser()
+
+
+@case('parser.parse.fast')
+def _parse_fast():
+    yield lambda: CommandLineParser(ARGV).parse()
+
+
+@case('parser.parse.argparse')
+def _parse_argparse():
+    yield lambda: CommandLineParser(ARGPARSE_ARGV).parse()
+
+
+@case('args.set_args')
+def _args_set_args():
+    parser = CommandLineParser(ARGV)
+    parser.parse()
+    values = parser.params.__dict__
+    yield lambda: Args().set_args(values)
+
+
+@case('args.access')
+def _args_access():
+    parser = CommandLineParser(ARGV)
+    parser.parse()
+    args = Args()
+    args.set_args(parser.params.__dict__)
+
+    def run():
+        args.log_level
+        args.common_int_param
+        args.common_list_param
+        args.a_mode_param
+    yield run
+
+
+def _logger_case(configure, log=None):
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        logger = Logger()
+        try:
+            logger.set_level('INFO')
+            configure(logger, Path(directory))
+            yield log or (lambda: logging.info('Benchmark record with a payload: %s.', 'x' * 40))
+        finally:
+            logger.close()
+            sys.stdout = stdout
+
+
+@case('logger.stdout_handler')
+def _logger_stdout():
+    yield from _logger_case(lambda logger, directory: logger.config_stdout_handler())
+
+
+@case('logger.file_handler')
+def _logger_file():
+    yield from _logger_case(lambda logger, directory: logger.config_log_file_handler(directory / 'benchmark.log'))
+
+
+@case('logger.debug_file_handler')
+def _logger_debug_file():
+    yield from _logger_case(
+        lambda logger, directory: logger.config_debug_log_file_handler(directory / 'benchmark_debug.log'))
+
+
+def _debug_payload_case(payload):
+    # Only INFO sinks are set up, so the DEBUG record is created but no handler formats it.
+    arguments = {f'argument_{i}': f'value_{i}' for i in range(25)}
+    yield from _logger_case(lambda logger, directory: logger.config_log_file_handler(directory / 'benchmark.log'),
+                            lambda: logging.debug('Raw parsed arguments:\n%s.', payload(arguments)))
+
+
+@case('logger.debug_payload.eager')
+def _debug_payload_eager():
+    yield from _debug_payload_case(lambda arguments: json.dumps(arguments, indent=4, separators=(';', ': ')))
+
+
+@case('logger.debug_payload.lazy')
+def _debug_payload_lazy():
+    yield from _debug_payload_case(lambda arguments: LazyJson(arguments, indent=4, separators=(';', ': ')))
+
+
+@case('redaction.format.10_secrets')
+def _redaction():
+    registry = SensitiveDataRegistry()
+    for i in range(10):
+        registry.add_literal(f'secret-{i:02}-value')
+    formatter = _HiddenSensitiveDataFormatter('%(levelname)s %(message)s', registry=registry)
+    record = logging.LogRecord('benchmark', logging.INFO, __file__, 0,
+                               'Connecting with password %s to %s.', ('secret-05-value', 'host'), None)
+    yield lambda: formatter.format(record)
+
+
+def _formatter_case(formatter):
+    record = logging.LogRecord('benchmark', logging.INFO, __file__, 0, 'Processing element %s of the list: %s.',
+                               (12, 'element'), None, 'process_unit')
+    yield lambda: formatter.format(record)
+
+
+@case('formatter.text.basic')
+def _formatter_text_basic():
+    yield from _formatter_case(_HiddenSensitiveDataFormatter(BASIC_FORMAT, DATE_FORMAT))
+
+
+@case('formatter.text.debug')
+def _formatter_text_debug():
+    yield from _formatter_case(_HiddenSensitiveDataFormatter(DEBUG_FORMAT, DATE_FORMAT))
+
+
+@case('formatter.json.basic')
+def _formatter_json_basic():
+    yield from _formatter_case(_JsonFormatter())
+
+
+@case('formatter.json.debug')
+def _formatter_json_debug():
+    yield from _formatter_case(_JsonFormatter(_DEBUG_JSON_FIELDS))
+
+
+@case('tuple_type.flat.10000')
+def _tuple_type_flat():
+    tuple_type = TupleType(sep=',')
+    string = ','.join(str(i) for i in range(10000))
+    yield lambda: tuple_type(string)
+
+
+@case('tuple_type.valid_values.10000')
+def _tuple_type_valid_values():
+    tuple_type = TupleType(sep=',', valid_values=[str(i) for i in range(100)])
+    string = ','.join(str(i % 100) for i in range(10000))
+    yield lambda: tuple_type(string)
+
+
+@case('tuple_type.int_array.10000')
+def _tuple_type_int_array():
+    tuple_type = TupleType(sep=',', element_type='int')
+    string = ','.join(str(i) for i in range(10000))
+    yield lambda: tuple_type(string)
+
+
+@case('tuple_type.nested.100x100')
+def _tuple_type_nested():
+    tuple_type = TupleType(sep=';,', nested=True)
+    string = ';'.join(','.join(str(j) for j in range(100)) for _ in range(100))
+    yield lambda: tuple_type(string)
+
+
+@case('iterable_to_string.10000')
+def _iterable_to_string():
+    elements = [f'element-{i}' for i in range(10000)]
+    yield lambda: iterable_to_string(con=elements, sep=',\n', wrap="'")
+
+
+@case('tracing.span.disabled')
+def _tracing_span_disabled():
+    def run():
+        with span('benchmark'):
+            pass
+    yield run
+
+
+@case('tracing.span.enabled')
+def _tracing_span_enabled():
+    tracer.enable()
+    try:
+        def run():
+            with span('benchmark'):
+                pass
+        yield run
+    finally:
+        tracer.disable()
+        tracer.clear()
+
+
+@case('metrics.counter.inc')
+def _metrics_counter():
+    yield MetricsRegistry().counter('benchmark_total', 'Benchmark counter.').inc
+
+
+@case('metrics.histogram.observe')
+def _metrics_histogram():
+    histogram = MetricsRegistry().histogram('benchmark_seconds', 'Benchmark histogram.')
+    yield lambda: histogram.observe(0.02)
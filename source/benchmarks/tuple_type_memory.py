@@ -0,0 +1,55 @@
+"""Parse time and memory of TupleType values at 10^6 elements: a tuple of strings against compact typed storage.
+
+Usage: python -m benchmarks.tuple_type_memory [ELEMENTS]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from template_package.lib.custom_types import TupleType
+
+ELEMENTS = 1000000
+
+VARIANTS = {
+    'str tuple': ({}, lambda i: str(i)),
+    'str tuple, valid_values': ({'valid_values': [str(i) for i in range(256)]}, lambda i: str(i % 256)),
+    'int array': ({'element_type': 'int'}, lambda i: str(i)),
+    'int array, valid_values': ({'element_type': 'int', 'valid_values': list(range(256))},
+                                lambda i: str(i % 256)),
+    'float array': ({'element_type': 'float'}, lambda i: f'{i}.5'),
+    'bytes memoryview': ({'element_type': 'bytes'}, lambda i: str(i % 256)),
+}
+
+
+def _measure(tuple_type: TupleType, string: str) -> tuple:
+    """Returns parse time in seconds, memory kept by the value and peak memory of parsing, in bytes.
+    """
+    start = time.perf_counter()
+    tuple_type(string)
+    elapsed = time.perf_counter() - start
+    # Memory is measured in a separate call, as tracing allocations slows parsing down.
+    tracemalloc.start()
+    value = tuple_type(string)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return elapsed, current, peak
+
+
+def main():
+    elements = int(sys.argv[1]) if len(sys.argv) > 1 else ELEMENTS
+    variants = dict(VARIANTS)
+    try:
+        import numpy  # noqa: F401
+        variants['int numpy'] = ({'element_type': 'int', 'backend': 'numpy'}, lambda i: str(i))
+    except ImportError:
+        print('numpy is not installed, its backend is skipped.')
+    for name, (kwargs, element) in variants.items():
+        string = ','.join(element(i) for i in range(elements))
+        elapsed, kept, peak = _measure(TupleType(sep=',', **kwargs), string)
+        print(f"{name:<26} parse={elapsed * 1000:8.1f}ms  kept={kept / 2 ** 20:7.1f}MiB  peak={peak / 2 ** 20:7.1f}MiB")
+
+
+if __name__ == '__main__':
+    main()
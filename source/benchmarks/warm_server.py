@@ -0,0 +1,49 @@
+"""Launch time of cold command line runs against runs forwarded to the warm-start server.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from template_package.client import SOCKET_ENV_NAME
+
+RUNS = 20
+ARGV = ['-l', 'WARNING', 'mode-a', '-a', 'value', '-ci', '1', '-cl', 'x', 'y']
+
+
+def _launch_times(command: list, runs: int, cwd: str, env: dict) -> list:
+    """Returns wall times of launches in milliseconds.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, 'server.sock')
+        env = dict(os.environ, PYTHONPATH=source_dir, **{SOCKET_ENV_NAME: socket_path})
+        server = subprocess.Popen([sys.executable, '-m', 'template_package.server', '--workers', '4'],
+                                  cwd=directory, env=env, stderr=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(socket_path):
+                time.sleep(0.05)
+            cold = _launch_times([sys.executable, '-m', 'template_package'] + ARGV, runs, directory, env)
+            warm = _launch_times([sys.executable, '-m', 'template_package.client'] + ARGV, runs, directory, env)
+        finally:
+            server.terminate()
+            server.wait()
+    for name, times in [('cold CLI', cold), ('warm server', warm)]:
+        print(f"{name:<12} mean={statistics.fmean(times):7.2f}ms median={statistics.median(times):7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,3 +2,14 @@
 """
 
 from template_package.config.constants import __name__, __version__, __author__
+
+# Public classes imported on first use, so importing the package stays cheap.
+_lazy_attributes = {'Config': 'template_package.config.config',
+                    'ScriptExitCode': 'template_package.config.script_exit_code'}
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        import importlib
+        return getattr(importlib.import_module(_lazy_attributes[name]), name)
+    raise AttributeError(f"module 'template_package' has no attribute '{name}'")
@@ -1,38 +1,137 @@
-import logging
-import template_package.config.config as con
-
-from template_package.config.config import Config
-from template_package.config.script_exit_code import ScriptExitCode
-
-
-def main():
-    script_exit_code = ScriptExitCode.OK
-    config = Config()
-    logging.debug('Parsed args: %s.', repr(config.args))
-    logging.debug('Mode: %s.', config.args.mode)
-    logging.info('Parameter provided as command line argument: log_level=%s.', config.args.log_level)
-    logging.info('Parameter provided as command line argument: basic_param=%s.', config.args.basic_param)
-    logging.info('Parameter provided as command line argument: common_int_param=%s.', config.args.common_int_param)
-    config.args.common_int_param = 45
-    print(config.args.__dict__)
-    logging.info('A new value of "common_int_param" argument is "%s"', config.args.common_int_param)
-    logging.info('Is common_int_param also a integer? - %s!', isinstance(config.args.common_int_param, int))
-    logging.info('Parameter provided as command line argument: common_list_param=%s.', config.args.common_list_param)
-    logging.info('The last element of the list: %s.', config.args.common_list_param[-1])
-    append_element = 'last'
-    logging.info('Appending "%s" to the list...', append_element)
-    config.args.common_list_param.append(append_element)
-    logging.info('Subsequent elements of the list:')
-    for i, j in enumerate(config.args.common_list_param):
-        print(i, j)
-    logging.info('Parameter provided as command line argument: a_mode_param=%s.', config.args.a_mode_param)
-    logging.info('Is a_mode_param also a string? - %s!', isinstance(config.args.a_mode_param, str))
-    if script_exit_code != ScriptExitCode.OK:
-        logging.error('%s', script_exit_code.message)
-    else:
-        logging.info('%s', script_exit_code.message)
-    logging.info('Script exiting with an error code: %s.', script_exit_code.code)
+import sys
+import time
+
+from template_package.config.constants import VERSION_INFO
+
+_VERSION_ARGV = (['-v'], ['--version'])
+
+
+async def async_main(argv: list = None) -> int:
+    """Runs the script in the running event loop.
+
+    Parameters
+    ----------
+    argv: list
+        Command line arguments, without the program name. Taken from sys.argv by default.
+
+    Returns
+    -------
+    int
+        The script exit code.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv in _VERSION_ARGV:
+        print(VERSION_INFO)
+        return 0
+    if argv[:1] == ['config']:
+        from template_package.config.snapshot_cache import run_command
+        return run_command(argv[1:])
+    import logging
+    from template_package.modes import run_mode_async
+    from template_package.config.basic_args import Profile, TraceFile
+    from template_package.config.config import Config
+    from template_package.config.script_exit_code import ScriptExitCode
+    from template_package.lib.lazy import LazyRepr
+    from template_package.lib.metrics import metrics
+
+    start_time = time.perf_counter()
+    profiler = _start_profiler(Profile.peek(argv))
+    trace_file = _start_tracing(TraceFile.peek(argv))
+    config = None
+    script_exit_code = None
+    try:
+        config = await Config.create_async(argv)
+        # Installed here, in the main thread, as the configuration is created in a worker thread.
+        config.install_signal_handlers()
+        # Started here, in the main thread, so the reloader can handle SIGHUP.
+        config.start_reloader()
+        # Profiling and tracing requested only in the configuration file cover running the mode.
+        if profiler is None:
+            profiler = _start_profiler(config.args.get(Profile.dest))
+        if trace_file is None:
+            trace_file = _start_tracing(config.args.get(TraceFile.dest))
+        logging.debug('Parsed args: %s.', LazyRepr(config.args))
+        logging.debug('Mode: %s.', config.args.get('mode'))
+        script_exit_code = await run_mode_async(config.args)
+        if script_exit_code != ScriptExitCode.OK:
+            logging.error('%s', script_exit_code.message)
+        else:
+            logging.info('%s', script_exit_code.message)
+        logging.info('Script exiting with an error code: %s.', script_exit_code.code)
+        metrics.gauge('exit_code', 'Exit code of the run.').set(script_exit_code.code)
+    finally:
+        metrics.gauge('run_duration_seconds', 'Duration of the run.').set(time.perf_counter() - start_time)
+        metrics.gauge('last_run_timestamp_seconds', 'Time the run finished, in seconds since the epoch.'
+                      ).set(time.time())
+        if trace_file is not None:
+            _write_trace(trace_file)
+        if profiler is not None:
+            profiler.stop()
+        if config is not None:
+            await config.close_async(failed=script_exit_code != ScriptExitCode.OK)
+    return script_exit_code.code
+
+
+def _start_tracing(path: str):
+    """Starts tracing if a trace file is given, returns the path.
+    """
+    if not path:
+        return None
+    from template_package.lib.tracing import tracer
+    tracer.enable()
+    return path
+
+
+def _write_trace(path: str):
+    """Stops tracing, writes the trace file and logs durations of the spans.
+    """
+    import logging
+    from template_package.lib.tracing import tracer
+    tracer.disable()
+    try:
+        tracer.write(path)
+    except OSError as exception:
+        logging.error('Trace file %s could not be written: %s.', path, exception)
+        return
+    summary = '\n'.join(f"{total:10.4f}s {count:>6} {name}" for name, (count, total) in tracer.summary().items())
+    logging.info('Trace written to %s. Spans (total time, count, name):\n%s', path, summary)
+    if tracer.dropped:
+        logging.warning('%s spans were dropped, the trace is incomplete.', tracer.dropped)
+
+
+def _start_profiler(kind: str):
+    """Starts profiling of given kind, returns None without importing profiling tools if it isn't requested.
+    """
+    if kind not in ('cpu', 'mem', 'both'):
+        return None
+    from template_package.config import constants
+    from template_package.lib.profiling import Profiler
+    profiler = Profiler(kind, constants.LOG_FILE_PATH)
+    profiler.start()
+    return profiler
+
+
+def main(argv: list = None) -> int:
+    """Runs the script, see async_main.
+
+    Parameters
+    ----------
+    argv: list
+        Command line arguments, without the program name. Taken from sys.argv by default.
+
+    Returns
+    -------
+    int
+        The script exit code.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv in _VERSION_ARGV:
+        # Answered without configuring logging or importing the rest of the package.
+        print(VERSION_INFO)
+        return 0
+    import asyncio
+    return asyncio.run(async_main(argv))
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
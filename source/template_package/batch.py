@@ -0,0 +1,173 @@
+"""Batch execution of the script.
+
+Runs many argument vectors in a single process, sharing the logger set up and the parser between them.
+The argument vectors are read as JSON lines, each one being either a list of command line arguments
+or an object with "argv" list and an optional "id". A JSON line with the result is written for each of them
+as soon as it finishes, so memory use doesn't depend on the input length.
+
+Usage: python -m template_package.batch [-i INPUT] [-o OUTPUT] [script basic arguments]
+"""
+
+import json
+import logging
+import sys
+
+from template_package.config.config import Config
+from template_package.config.script_exit_code import ScriptExitCode
+from template_package.lib.exit_code import ExitCode
+from template_package.lib.metrics import metrics
+from template_package.modes import run_mode
+
+
+def parse_item(line: str):
+    """Reads an item of the batch.
+
+    Parameters
+    ----------
+    line: str
+        A JSON line with the item.
+
+    Returns
+    -------
+    tuple
+        An identifier of the item (None if not given) and its command line arguments.
+
+    Raises
+    ------
+    ValueError
+        If the line isn't a valid item.
+    """
+    item = json.loads(line)
+    item_id = None
+    if isinstance(item, dict):
+        item_id = item.get('id')
+        item = item.get('argv')
+    if not isinstance(item, list) or not all(isinstance(arg, str) for arg in item):
+        raise ValueError('an item should be a list of strings or an object with "argv" list of strings')
+    return item_id, item
+
+
+def run_item(config: Config, argv: list):
+    """Runs the script for a single item of the batch.
+
+    Parameters
+    ----------
+    config: Config
+        The configuration shared by all items.
+    argv: list
+        Command line arguments of the item, without the program name.
+
+    Returns
+    -------
+    tuple
+        The item exit code and a description of the error, None if there wasn't any.
+    """
+    try:
+        args = config.resolve(argv)
+    except (OSError, ValueError) as exception:
+        logging.error('Configuration error: %s.', exception)
+        return ScriptExitCode.SOME_OTHER_ERROR, f"Configuration error: {exception}."
+    except SystemExit as exception:
+        code = exception.code if isinstance(exception.code, int) else (0 if exception.code is None else 1)
+        exit_code = ScriptExitCode.from_code(code)
+        return exit_code, None if exit_code is ScriptExitCode.OK else 'Invalid command line arguments.'
+    try:
+        exit_code = run_mode(args)
+    except Exception as exception:
+        logging.exception('Batch item failed.')
+        return ScriptExitCode.INTERNAL_ERROR, f"{type(exception).__name__}: {exception}"
+    return exit_code, None
+
+
+def run_batch(config: Config, input_file, output_file) -> ExitCode:
+    """Runs all items read from the input and writes their results to the output.
+
+    Parameters
+    ----------
+    config: Config
+        The configuration shared by all items.
+    input_file: TextIO
+        A stream of JSON lines with the items.
+    output_file: TextIO
+        A stream the results are written to, one JSON line per item.
+
+    Returns
+    -------
+    ExitCode
+        OK if all items succeeded, otherwise the exit code of the first failed item.
+    """
+    batch_exit_code = ScriptExitCode.OK
+    items = failed = 0
+    item_codes = metrics.counter('batch_items_total', 'Batch items by exit code.', ('code',))
+    for index, line in enumerate(input_file):
+        if not line.strip():
+            continue
+        items += 1
+        item_id = None
+        try:
+            item_id, argv = parse_item(line)
+        except ValueError as exception:
+            exit_code, error = ScriptExitCode.SOME_OTHER_ERROR, f"Invalid item: {exception}."
+        else:
+            logging.debug('Running batch item %s: %s.', index, argv)
+            exit_code, error = run_item(config, argv)
+        item_codes.labels(exit_code.code).inc()
+        result = {'index': index, 'code': exit_code.code, 'message': exit_code.message}
+        if item_id is not None:
+            result['id'] = item_id
+        if error is not None:
+            result['error'] = error
+        output_file.write(json.dumps(result) + '\n')
+        output_file.flush()
+        if exit_code is not ScriptExitCode.OK:
+            failed += 1
+            if batch_exit_code is ScriptExitCode.OK:
+                batch_exit_code = exit_code
+    logging.info('Batch finished: %s items, %s failed.', items, failed)
+    return batch_exit_code
+
+
+def main(argv: list = None) -> int:
+    """Runs the batch.
+
+    Parameters
+    ----------
+    argv: list
+        Command line arguments, without the program name. Taken from sys.argv by default.
+
+    Returns
+    -------
+    int
+        The batch exit code.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m template_package.batch',
+                                     description='Runs the script for each argument vector given as a JSON line.',
+                                     epilog='Remaining arguments are basic arguments of the script, e.g. -l DEBUG.\n'
+                                            'They set up logging shared by all items, logging arguments of items '
+                                            'are ignored.\nLog records printed to the standard output are mixed '
+                                            'with the results unless OUTPUT is a file.',
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     allow_abbrev=False)
+    parser.add_argument('-i', '--input', default='-', help='A file with JSON lines, the standard input by default.')
+    parser.add_argument('-o', '--output', default='-', help='A file the results are written to, '
+                                                            'the standard output by default.')
+    params, script_argv = parser.parse_known_args(argv)
+    config = Config(script_argv)
+    config.install_signal_handlers()
+    input_file = sys.stdin if params.input == '-' else open(params.input, encoding='utf-8')
+    output_file = sys.stdout if params.output == '-' else open(params.output, 'w', encoding='utf-8')
+    exit_code = None
+    try:
+        exit_code = run_batch(config, input_file, output_file)
+        metrics.gauge('exit_code', 'Exit code of the run.').set(exit_code.code)
+    finally:
+        for stream in (input_file, output_file):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+        config.close(failed=exit_code != ScriptExitCode.OK)
+    return exit_code.code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Warm-start server client.
+
+Forwards the command line to the warm-start server (see template_package.server) and exits with
+the exit code of the run. The script is run in-process if the server isn't available.
+The module implements also the request protocol and imports as little as possible.
+
+Usage: python -m template_package.client [script arguments]
+"""
+
+import marshal
+import os
+import socket
+import struct
+import sys
+
+from template_package.config.constants import SCRIPT_NAME_FORMATTED
+
+SOCKET_ENV_NAME = 'TEMPLATE_PACKAGE_SOCKET'
+HEADER = struct.Struct('!I')
+EXIT_CODE = struct.Struct('!i')
+
+
+def default_socket_path() -> str:
+    """Returns a path of the server socket, taken from TEMPLATE_PACKAGE_SOCKET environment variable
+    or placed in the per-user runtime directory (XDG_RUNTIME_DIR). Without it, the socket is placed
+    in a directory of the temporary directory which only the user can access, see private_directory.
+    """
+    if os.environ.get(SOCKET_ENV_NAME):
+        return os.environ[SOCKET_ENV_NAME]
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], f"{SCRIPT_NAME_FORMATTED}.sock")
+    return os.path.join(os.environ.get('TMPDIR') or '/tmp', f"{SCRIPT_NAME_FORMATTED}-{os.getuid()}",
+                        'server.sock')
+
+
+def private_directory(path: str):
+    """Creates a directory only the user can access, if it doesn't exist.
+
+    Raises
+    ------
+    PermissionError
+        If the directory exists but belongs to another user or others can access it.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    stat = os.stat(path)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        raise PermissionError(f"{path} should belong to the user and be accessible only by them")
+
+
+def peer_uid(connection: socket.socket, path: str) -> int:
+    """Returns a user id of the process listening on the other end of a Unix socket connection.
+    The owner of the socket file is returned where the system doesn't tell the peer credentials.
+    """
+    if hasattr(socket, 'SO_PEERCRED'):
+        credentials = struct.Struct('3i')
+        _, uid, _ = credentials.unpack(connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                                             credentials.size))
+        return uid
+    return os.stat(path).st_uid
+
+
+def send_request(connection: socket.socket, argv: list):
+    """Sends a request to run given arguments with the current process directory, environment and streams.
+
+    Parameters
+    ----------
+    connection: socket.socket
+        A socket connected to the server.
+    argv: list
+        Command line arguments, the first one is the program name.
+    """
+    payload = marshal.dumps({'argv': argv, 'cwd': os.getcwd(), 'env': dict(os.environ)})
+    message = HEADER.pack(len(payload)) + payload
+    sent = socket.send_fds(connection, [message], [sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno()])
+    connection.sendall(message[sent:])
+
+
+def receive_exit_code(connection: socket.socket) -> int:
+    """Waits for the exit code of a request sent to the server.
+    """
+    data = b''
+    while len(data) < EXIT_CODE.size:
+        chunk = connection.recv(EXIT_CODE.size - len(data))
+        if not chunk:
+            raise ConnectionError('the server closed the connection without sending an exit code')
+        data += chunk
+    return EXIT_CODE.unpack(data)[0]
+
+
+def main() -> int:
+    path = default_socket_path()
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+        # The environment and the standard streams are sent, so only a server of the same user gets them.
+        if peer_uid(connection, path) != os.getuid():
+            raise PermissionError(f"the server listening on {path} is run by another user")
+    except OSError as exception:
+        connection.close()
+        if isinstance(exception, PermissionError):
+            print(f"Warm-start server isn't used: {exception}.", file=sys.stderr)
+        from template_package.__main__ import main as run_locally
+        return run_locally(sys.argv[1:])
+    with connection:
+        send_request(connection, sys.argv)
+        return receive_exit_code(connection)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
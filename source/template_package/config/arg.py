@@ -2,19 +2,53 @@
 
 It's high level abstract of argument used in the script.
 """
+import os
 from abc import ABC
 
 
 class Arg(ABC):
+    """An argument value. Subclasses derive also from a builtin type (str, int, list), the value is kept
+    only by the builtin part. No instance dictionary is created as the subclasses declare empty slots.
+    """
 
+    __slots__ = ()
+
+    _flag = None
+    _name = None
     dest = None
     env_name = None
+    # A type of list argument elements: int, float or bytes keeps them in a compact array, see compact_array
+    # of custom_types module. None keeps a list of strings.
+    element_type = None
+
+    @classmethod
+    def peek(cls, argv: list, environ=None) -> str:
+        """Finds a raw value of the argument before the command line is parsed, e.g. to act on it early.
 
-    def __init__(self, value):
-        self._value = value
+        Only the exact flag or name followed by the value ("-p cpu", "--profile cpu" or "--profile=cpu")
+        is recognised in the command line. If it isn't found there, the environment variable is checked.
 
-    def __str__(self):
-        return str(self._value)
+        Parameters
+        ----------
+        argv: list
+            Command line arguments, without the program name.
+        environ: Mapping
+            Environment variables, os.environ by default.
+
+        Returns
+        -------
+        str
+            The last value given in the command line, the environment variable value or None.
+        """
+        value = None
+        for i, token in enumerate(argv):
+            if token in (cls._flag, cls._name) and i + 1 < len(argv):
+                value = argv[i + 1]
+            elif cls._name and token.startswith(cls._name + '='):
+                value = token.split('=', 1)[1]
+        if value is None and cls.env_name:
+            value = (os.environ if environ is None else environ).get(cls.env_name)
+        return value
 
     @staticmethod
     def add_arg(arg_group):
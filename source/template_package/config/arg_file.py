@@ -0,0 +1,254 @@
+"""Streaming reader of @file argument files.
+
+An argument file holds one command line argument per line, as argparse reads it. The file is memory-mapped
+and scanned once: other arguments are decoded at once, while values of list arguments are left in the file
+and decoded in chunks each time they are iterated over, so memory use doesn't depend on their number.
+Lines are separated by "\\n" or "\\r\\n". The file shouldn't change while the script runs.
+
+A list argument may also be given a single source of values instead of the values themselves: "@-" for
+the standard input or "@path" for a file with one value per line, e.g. "-cl @-". Such values are read
+line by line while they are iterated over, once, see StreamValues.
+"""
+
+import itertools
+import locale
+import mmap
+import os
+import re
+import sys
+
+CHUNK_SIZE = 1 << 20
+
+# A line ending a run of list values: the next option or another argument file.
+_RUN_END = re.compile(rb'^[-@]', re.M)
+
+
+def _decode(data: bytes) -> str:
+    # The same encoding argparse reads argument files with.
+    return data.decode(locale.getpreferredencoding(False))
+
+
+def _release(data: mmap.mmap, start: int, end: int):
+    """Lets the system drop pages of the mapped file which have been read, so they don't add up in RSS.
+    """
+    if hasattr(mmap, 'MADV_DONTNEED'):
+        start -= start % mmap.PAGESIZE
+        if end > start:
+            data.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def _find_run_end(data: mmap.mmap, position: int, size: int) -> int:
+    """Returns an offset of the line ending a run of list values which starts at given position.
+    """
+    while position < size:
+        window_end = min(position + CHUNK_SIZE, size)
+        match = _RUN_END.search(data, position, window_end)
+        _release(data, position, window_end)
+        if match is not None:
+            return match.start()
+        position = window_end
+    return size
+
+
+class FileValues:
+    """Values of a list argument kept in an argument file, decoded while they are iterated over.
+
+    Elements appended to the values are kept in memory and come after the ones from the file.
+
+    Keyword arguments
+    -----------------
+    path: str
+        A path of the argument file.
+    start: int
+        An offset of the first line with a value.
+    end: int
+        An offset right after the last line with a value.
+    convert: Callable
+        A function converting a string into a value, values are strings if None.
+    """
+
+    __slots__ = ('path', '_start', '_end', '_convert', '_length', '_appended')
+
+    def __init__(self, path: str, start: int, end: int, convert=None):
+        self.path = path
+        self._start = start
+        self._end = end
+        self._convert = convert
+        self._length = None
+        self._appended = []
+
+    def _lines(self, data) -> list:
+        lines = _decode(data).split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        lines = [line[:-1] if line.endswith('\r') else line for line in lines]
+        return lines if self._convert is None else [self._convert(line) for line in lines]
+
+    def _chunks(self):
+        """Yields the values from the file, split into chunks of about CHUNK_SIZE bytes at line ends.
+        """
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = self._start
+            while position < self._end:
+                stop = data.find(b'\n', min(position + CHUNK_SIZE, self._end) - 1, self._end)
+                stop = self._end if stop < 0 else stop + 1
+                lines = self._lines(data[position:stop])
+                _release(data, position, stop)
+                yield lines
+                position = stop
+
+    def __iter__(self):
+        for chunk in self._chunks():
+            yield from chunk
+        yield from self._appended
+
+    def __len__(self):
+        if self._length is None:
+            self._length = 0
+            with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for position in range(self._start, self._end, CHUNK_SIZE):
+                    self._length += data[position:min(position + CHUNK_SIZE, self._end)].count(b'\n')
+                    _release(data, position, min(position + CHUNK_SIZE, self._end))
+                if data[self._end - 1:self._end] != b'\n':
+                    self._length += 1
+        return self._length + len(self._appended)
+
+    def __getitem__(self, index: int):
+        if not isinstance(index, int):
+            raise TypeError(f"{type(self).__name__} indices must be integers, not {type(index).__name__}")
+        length = len(self)
+        file_length = length - len(self._appended)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        if index >= file_length:
+            return self._appended[index - file_length]
+        if index == file_length - 1:
+            return self._last()
+        return next(itertools.islice(self, index, None))
+
+    def _last(self):
+        """Returns the last value from the file, reading only its line.
+        """
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = self._end - 1 if data[self._end - 1:self._end] == b'\n' else self._end
+            return self._lines(data[data.rfind(b'\n', self._start, end) + 1:end])[0]
+
+    def append(self, value):
+        """Adds a value after the ones from the file.
+        """
+        self._appended.append(value)
+
+    def __repr__(self):
+        return f"<{len(self)} values from {self.path}>"
+
+
+class StreamValues:
+    """Values of a list argument read line by line from the standard input or a file, in a single pass.
+
+    Only the line being processed is kept in memory, so the source may be unbounded. Elements appended
+    to the values are kept in memory and come after the ones from the source.
+
+    Keyword arguments
+    -----------------
+    path: str
+        A path of the file with one value per line or "-" for the standard input.
+
+    Raises
+    ------
+    OSError
+        If the file can't be opened.
+    """
+
+    __slots__ = ('path', '_consumed', '_appended')
+
+    def __init__(self, path: str):
+        if path != '-':
+            # Fails early on a missing file, though it's read only when the values are iterated over.
+            with open(path, 'rb'):
+                pass
+        self.path = path
+        self._consumed = False
+        self._appended = []
+
+    def _read(self):
+        if self.path == '-':
+            yield from self._values(sys.stdin)
+        else:
+            with open(self.path, encoding=locale.getpreferredencoding(False)) as file:
+                yield from self._values(file)
+        yield from self._appended
+
+    @staticmethod
+    def _values(file):
+        for line in file:
+            yield line[:-1] if line.endswith('\n') else line
+
+    def __iter__(self):
+        if self._consumed:
+            raise RuntimeError(f"{self!r} can be iterated over only once")
+        self._consumed = True
+        return self._read()
+
+    def batches(self, size: int):
+        """Yields lists of subsequent values, of given size except for the last one.
+        """
+        values = iter(self)
+        while batch := list(itertools.islice(values, size)):
+            yield batch
+
+    def append(self, value):
+        """Adds a value after the ones from the source.
+        """
+        self._appended.append(value)
+
+    def __repr__(self):
+        return f"<values streamed from {'stdin' if self.path == '-' else self.path}>"
+
+
+def read_arg_file(path: str, list_specs: dict) -> list:
+    """Reads arguments from an argument file, values of list arguments are read lazily.
+
+    Parameters
+    ----------
+    path: str
+        A path of the file. Argument files given in it ("@path" lines) are read as well.
+    list_specs: dict
+        Parsing rules (ArgSpec) of list arguments, keyed by option string.
+
+    Returns
+    -------
+    list
+        The arguments. A run of values following a list argument option is given as a single FileValues.
+
+    Raises
+    ------
+    OSError
+        If a file can't be read.
+    """
+    path = os.path.abspath(path)
+    tokens = []
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return tokens
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while position < size:
+                line_end = data.find(b'\n', position)
+                line_end = size if line_end < 0 else line_end
+                token = _decode(data[position:line_end]).removesuffix('\r')
+                position = line_end + 1
+                if token.startswith('@'):
+                    tokens.extend(read_arg_file(token[1:], list_specs))
+                    continue
+                tokens.append(token)
+                spec = list_specs.get(token)
+                if spec is not None:
+                    run_end = _find_run_end(data, position, size)
+                    if run_end > position:
+                        convert = spec.convert if spec.type is not None or spec.choices is not None else None
+                        tokens.append(FileValues(path, position, run_end, convert))
+                    position = run_end
+    return tokens
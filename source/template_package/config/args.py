@@ -1,119 +1,163 @@
 """Args class implementation.
 
-The class is dict-list object containing all arguments used in the script.
+The class is a compact, read-only record containing all arguments used in the script.
 """
 
 import logging
-
-from template_package.config.basic_args import BasicParam, LogLevel, LogMode
+from collections.abc import Mapping
+
+from template_package.config.arg_file import FileValues, StreamValues
+from template_package.config.basic_args import (BasicParam, ConfigCache, ConfigFile, ConfigReload, ConfigReloadInterval,
+                                                DebugLogRecorder, Executor, LogAsync, LogBackupCount, LogBufferRecords,
+                                                LogBufferSize, LogCompression, LogFlushInterval, LogFormat, LogFsync,
+                                                LogLevel, LogMaxBytes, LogMode, LogQueueSize, LogRotateWhen,
+                                                MetricsFile, MetricsInterval, Profile, TraceFile, Workers)
 from template_package.config.common_args import CommonIntParam, CommonListParam
 from template_package.config.mode import Mode
 from template_package.config.mode_a_args import AModeOnlyParam
 from template_package.config.notset import NotSetError
-from template_package.lib.utilities import gen_exception_handling_log_msg
 
 
-class Args(dict):
+class Args(Mapping):
     """A class representing all arguments used in the script.
+
+    A slot is generated for each argument class, so reading an argument is a plain attribute access,
+    e.g. "args.log_level". Reading an argument which hasn't been set raises NotSetError,
+    optional arguments are read with get method, e.g. "args.get(CommonIntParam.dest)", which returns None then.
+    Arguments are frozen once set up, except those listed in _setters.
+    The object is also a read-only mapping of argument destinations to values.
     """
 
     _arg_class = [LogLevel,
+                  LogFormat,
                   LogMode,
+                  LogMaxBytes,
+                  LogRotateWhen,
+                  LogBackupCount,
+                  LogCompression,
+                  LogBufferSize,
+                  LogBufferRecords,
+                  LogFlushInterval,
+                  LogFsync,
+                  DebugLogRecorder,
+                  LogAsync,
+                  LogQueueSize,
+                  ConfigFile,
+                  ConfigCache,
+                  ConfigReload,
+                  ConfigReloadInterval,
                   BasicParam,
+                  Workers,
+                  Executor,
+                  Profile,
+                  TraceFile,
+                  MetricsFile,
+                  MetricsInterval,
                   Mode,
                   CommonIntParam,
                   CommonListParam,
                   AModeOnlyParam]
 
-    def __repr__(self):
-        return 'Args(' + ', '.join([f"{key}={value}" for key, value in self.items()]) + ')'
-
-    def set_args(self, parsed_args):
-        for arg in self._arg_class:
-            try:
-                value = parsed_args[arg.dest]
-                logging.debug('Setting up %s=%s.', arg.dest, value)
-                self.__setitem__(arg.dest, arg(value))
-            except KeyError as exception:
-                logging.debug(gen_exception_handling_log_msg(exception))
-                logging.debug('Value for "%s" argument wasn\'t provided.', arg.dest)
-
-    # -------------
-    # Basic params.
-    # -------------
-
-    @property
-    def log_level(self):
-        try:
-            return self.__getitem__(LogLevel.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{LogLevel.dest} hasn't been set")
+    _dests = tuple(arg.dest for arg in _arg_class)
+    __slots__ = _dests + ('_sources',)
 
-    @property
-    def log_mode(self):
-        try:
-            return self.__getitem__(LogMode.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{LogMode.dest} hasn't been set")
+    # Alternative names of arguments.
+    _aliases = {'a_mode_param': AModeOnlyParam.dest}
 
-    @property
-    def basic_param(self):
-        try:
-            return self.__getitem__(BasicParam.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{BasicParam.dest} hasn't been set")
+    # Arguments which can be changed after set up, with a type of the new value.
+    _setters = {CommonIntParam.dest: int}
 
-    # --------------
-    # Mode params.
-    # --------------
+    def __repr__(self):
+        return 'Args(' + ', '.join([f"{key}={value}" for key, value in self.items()]) + ')'
 
-    @property
-    def mode(self):
+    def __getattr__(self, name):
+        # Called only if the attribute lookup failed, i.e. the argument hasn't been set.
+        dest = self._aliases.get(name, name)
+        if dest in self._dests:
+            logging.debug('Value for "%s" argument was requested but it hasn\'t been set.', dest)
+            raise NotSetError(f"{dest} hasn't been set")
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        dest = self._aliases.get(name, name)
+        if dest not in self._setters:
+            raise AttributeError(f"{dest} argument can't be changed")
+        value_type = self._setters[dest]
+        if not isinstance(value, value_type):
+            raise AttributeError(f"provided value for {dest} argument is {type(value).__name__},"
+                                 f" it should be {value_type.__name__}")
+        logging.debug('Setting %s=%s.', dest, value)
+        object.__setattr__(self, dest, value)
+
+    def __getitem__(self, key):
+        if key not in self._dests:
+            raise KeyError(key)
         try:
-            return self.__getitem__(Mode.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{Mode.dest} hasn't been set")
-
-    # --------------
-    # Common params.
-    # --------------
+            return object.__getattribute__(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
 
-    @property
-    def common_int_param(self):
-        try:
-            return self.__getitem__(CommonIntParam.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{CommonIntParam.dest} hasn't been set")
-
-    @common_int_param.setter
-    def common_int_param(self, value):
-        if not isinstance(value, int):
-            raise AttributeError(f"provided value for {CommonIntParam.dest} argument is {type(value).__name__},"
-                                 f" it should be {int.__name__}")
-        logging.debug(f"Setting {CommonIntParam.dest}={value}.")
-        self.__setitem__(CommonIntParam.dest, value)
-
-    @property
-    def common_list_param(self):
+    def __iter__(self):
+        for dest in self._dests:
+            try:
+                object.__getattribute__(self, dest)
+            except AttributeError:
+                continue
+            yield dest
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __getstate__(self):
+        return self.as_dict(), self.sources()
+
+    def __setstate__(self, state):
+        values, sources = state
+        for dest, value in values.items():
+            object.__setattr__(self, dest, value)
+        object.__setattr__(self, '_sources', sources)
+
+    def as_dict(self) -> dict:
+        """Returns a dictionary of the arguments which have been set.
+        """
+        return dict(self.items())
+
+    def source(self, name: str) -> str:
+        """Returns a name of the layer the argument value comes from, e.g. "cli", "env", "file" or "default".
+        """
+        dest = self._aliases.get(name, name)
+        getattr(self, dest)
+        return self.sources().get(dest)
+
+    def sources(self) -> dict:
+        """Returns names of layers the argument values come from, keyed by argument destination.
+        """
         try:
-            return self.__getitem__(CommonListParam.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{CommonListParam.dest} hasn't been set")
-
-    # --------------
-    # A-mode params.
-    # --------------
+            return object.__getattribute__(self, '_sources')
+        except AttributeError:
+            return {}
 
-    @property
-    def a_mode_param(self):
-        try:
-            return self.__getitem__(AModeOnlyParam.dest)
-        except KeyError as exception:
-            logging.debug(gen_exception_handling_log_msg(exception))
-            raise NotSetError(f"{AModeOnlyParam.dest} hasn't been set")
+    def set_args(self, parsed_args, sources: dict = None):
+        object.__setattr__(self, '_sources', {dest: layer for dest, layer in (sources or {}).items()
+                                              if parsed_args.get(dest) is not None})
+        for arg in self._arg_class:
+            value = parsed_args.get(arg.dest)
+            if value is None:
+                logging.debug('Value for "%s" argument wasn\'t provided.', arg.dest)
+                continue
+            logging.debug('Setting up %s=%s.', arg.dest, value)
+            # Values read lazily from a file or the standard input are kept as they are, converting them would read
+            # all of them.
+            if isinstance(value, (FileValues, StreamValues)):
+                object.__setattr__(self, arg.dest, value)
+            elif arg.element_type is not None:
+                # Imported here, the module imports argparse which isn't needed otherwise.
+                from template_package.lib.custom_types import compact_array
+                object.__setattr__(self, arg.dest, compact_array(value, arg.element_type))
+            else:
+                object.__setattr__(self, arg.dest, arg(value))
+
+
+# Alias names share the slot of the original argument.
+for _alias, _dest in Args._aliases.items():
+    setattr(Args, _alias, getattr(Args, _dest))
@@ -6,10 +6,12 @@ from template_package.config.arg import Arg
 
 class LogLevel(Arg, str):
 
+    __slots__ = ()
+
     _flag = '-l'
     _name = '--log-level'
     dest = 'log_level'
-    env_name = 'LOG_LEVEL'
+    env_name = 'TEMPLATE_PACKAGE_LOG_LEVEL'
 
     @staticmethod
     def add_arg(arg_group):
@@ -24,10 +26,12 @@ class LogLevel(Arg, str):
 # TODO: Assess whether required.
 class LogMode(Arg, str):
 
+    __slots__ = ()
+
     _flag = '-m'
     _name = '--log-mode'
     dest = 'log_mode'
-    env_name = 'LOG_MODE'
+    env_name = 'TEMPLATE_PACKAGE_LOG_MODE'
 
     @staticmethod
     def add_arg(arg_group):
@@ -36,16 +40,18 @@ class LogMode(Arg, str):
                                dest=LogMode.dest,
                                choices=['w', 'a'],
                                default='w',
-                               help='Sets logging mode.It sets weather LOG-file\n'
-                                    'should be overwritten (w) or not (a).')
+                               help='Sets logging mode. It sets whether log files\n'
+                                    'should be overwritten (w) or appended to (a).')
 
 
 class BasicParam(Arg, str):
 
+    __slots__ = ()
+
     _flag = '-b'
     _name = '--basic-param'
     dest = 'basic_param'
-    env_name = 'BASIC_PARAM'
+    env_name = 'TEMPLATE_PACKAGE_BASIC_PARAM'
 
     @staticmethod
     def add_arg(arg_group):
@@ -54,3 +60,439 @@ class BasicParam(Arg, str):
                                dest=BasicParam.dest,
                                default='basic_param_default_value',
                                help='Set a basic parameter.')
+
+
+class LogAsync(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-la'
+    _name = '--log-async'
+    dest = 'log_async'
+    env_name = 'TEMPLATE_PACKAGE_LOG_ASYNC'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogAsync._flag,
+                               LogAsync._name,
+                               dest=LogAsync.dest,
+                               choices=['off', 'block', 'drop-new', 'drop-old'],
+                               default='off',
+                               help='Enables asynchronous logging. Records are put into a bounded queue\n'
+                                    'and written by a background thread. The value sets what happens\n'
+                                    'when the queue is full: wait (block), discard the new record\n'
+                                    '(drop-new) or discard the oldest queued one (drop-old).')
+
+
+class LogQueueSize(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-lq'
+    _name = '--log-queue-size'
+    dest = 'log_queue_size'
+    env_name = 'TEMPLATE_PACKAGE_LOG_QUEUE_SIZE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogQueueSize._flag,
+                               LogQueueSize._name,
+                               dest=LogQueueSize.dest,
+                               type=int,
+                               default=10000,
+                               help='Sets a maximum number of records waiting in the asynchronous logging queue.')
+
+
+class ConfigFile(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-cf'
+    _name = '--config-file'
+    dest = 'config_file'
+    env_name = 'TEMPLATE_PACKAGE_CONFIG_FILE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(ConfigFile._flag,
+                               ConfigFile._name,
+                               dest=ConfigFile.dest,
+                               help='Sets a path to INI or TOML configuration file. Keys are parameter names\n'
+                                    'without leading dashes, e.g. "log-level = DEBUG". Parameters given in\n'
+                                    'the command line or via environment variables take precedence.')
+
+
+class Workers(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-w'
+    _name = '--workers'
+    dest = 'workers'
+    env_name = 'TEMPLATE_PACKAGE_WORKERS'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(Workers._flag,
+                               Workers._name,
+                               dest=Workers.dest,
+                               type=int,
+                               default=1,
+                               help='Sets a number of workers processing work units of the mode.\n'
+                                    'Units are processed one by one in the main process if it is 1,\n'
+                                    '0 means one worker per CPU.')
+
+
+class Executor(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-e'
+    _name = '--executor'
+    dest = 'executor'
+    env_name = 'TEMPLATE_PACKAGE_EXECUTOR'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(Executor._flag,
+                               Executor._name,
+                               dest=Executor.dest,
+                               choices=['process', 'thread', 'asyncio'],
+                               default='process',
+                               help='Sets a kind of the workers pool: processes for CPU bound work,\n'
+                                    'threads or asyncio coroutines for I/O bound work. With asyncio\n'
+                                    'the number of workers limits units processed concurrently.')
+
+
+class Profile(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-p'
+    _name = '--profile'
+    dest = 'profile'
+    env_name = 'TEMPLATE_PACKAGE_PROFILE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(Profile._flag,
+                               Profile._name,
+                               dest=Profile.dest,
+                               choices=['cpu', 'mem', 'both'],
+                               help='Profiles the run: CPU time with cProfile, memory allocations with\n'
+                                    'tracemalloc or both. Results are written next to the log file\n'
+                                    'and summarised in the log. Set in the configuration file, profiling\n'
+                                    'covers only running the mode.')
+
+
+class TraceFile(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-tf'
+    _name = '--trace-file'
+    dest = 'trace_file'
+    env_name = 'TEMPLATE_PACKAGE_TRACE_FILE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(TraceFile._flag,
+                               TraceFile._name,
+                               dest=TraceFile.dest,
+                               help='Traces configuration phases and the mode work and writes them to given\n'
+                                    'file as Chrome trace events, viewable in chrome://tracing or Perfetto.')
+
+
+class MetricsFile(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-mf'
+    _name = '--metrics-file'
+    dest = 'metrics_file'
+    env_name = 'TEMPLATE_PACKAGE_METRICS_FILE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(MetricsFile._flag,
+                               MetricsFile._name,
+                               dest=MetricsFile.dest,
+                               help='Writes metrics of the run to given file in Prometheus text format,\n'
+                                    'e.g. for node-exporter textfile collector (use .prom extension).')
+
+
+class MetricsInterval(Arg, float):
+
+    __slots__ = ()
+
+    _flag = '-mi'
+    _name = '--metrics-interval'
+    dest = 'metrics_interval'
+    env_name = 'TEMPLATE_PACKAGE_METRICS_INTERVAL'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(MetricsInterval._flag,
+                               MetricsInterval._name,
+                               dest=MetricsInterval.dest,
+                               type=float,
+                               default=15.0,
+                               help='Sets a number of seconds between writes of the metrics file during the run,\n'
+                                    '0 means writing it only at exit.')
+
+
+class LogMaxBytes(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-lmb'
+    _name = '--log-max-bytes'
+    dest = 'log_max_bytes'
+    env_name = 'TEMPLATE_PACKAGE_LOG_MAX_BYTES'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogMaxBytes._flag,
+                               LogMaxBytes._name,
+                               dest=LogMaxBytes.dest,
+                               type=int,
+                               default=0,
+                               help='Rotates a log file when it reaches given size, 0 disables rotation by size.')
+
+
+class LogRotateWhen(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-lrw'
+    _name = '--log-rotate-when'
+    dest = 'log_rotate_when'
+    env_name = 'TEMPLATE_PACKAGE_LOG_ROTATE_WHEN'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogRotateWhen._flag,
+                               LogRotateWhen._name,
+                               dest=LogRotateWhen.dest,
+                               choices=['S', 'M', 'H', 'D', 'midnight'],
+                               help='Rotates log files every second (S), minute (M), hour (H), day (D)\n'
+                                    'or at midnight.')
+
+
+class LogBackupCount(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-lbc'
+    _name = '--log-backup-count'
+    dest = 'log_backup_count'
+    env_name = 'TEMPLATE_PACKAGE_LOG_BACKUP_COUNT'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogBackupCount._flag,
+                               LogBackupCount._name,
+                               dest=LogBackupCount.dest,
+                               type=int,
+                               default=5,
+                               help='Sets a number of rotated log segments kept, 0 means keeping all of them.')
+
+
+class LogCompression(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-lcm'
+    _name = '--log-compression'
+    dest = 'log_compression'
+    env_name = 'TEMPLATE_PACKAGE_LOG_COMPRESSION'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogCompression._flag,
+                               LogCompression._name,
+                               dest=LogCompression.dest,
+                               choices=['gzip', 'none'],
+                               default='gzip',
+                               help='Sets compression of rotated log segments, done in the background.')
+
+
+class LogBufferSize(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-lbs'
+    _name = '--log-buffer-size'
+    dest = 'log_buffer_size'
+    env_name = 'TEMPLATE_PACKAGE_LOG_BUFFER_SIZE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogBufferSize._flag,
+                               LogBufferSize._name,
+                               dest=LogBufferSize.dest,
+                               type=int,
+                               default=0,
+                               help='Sets a size of log records kept in memory before they are written to log files,\n'
+                                    '0 (default) writes every record at once. ERROR records are always written\n'
+                                    'at once. --log-buffer-records and --log-flush-interval apply if it is set.')
+
+
+class LogBufferRecords(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-lbr'
+    _name = '--log-buffer-records'
+    dest = 'log_buffer_records'
+    env_name = 'TEMPLATE_PACKAGE_LOG_BUFFER_RECORDS'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogBufferRecords._flag,
+                               LogBufferRecords._name,
+                               dest=LogBufferRecords.dest,
+                               type=int,
+                               default=1000,
+                               help='Sets a number of log records kept in memory before they are written to\n'
+                                    'log files, 0 disables this limit.')
+
+
+class LogFlushInterval(Arg, float):
+
+    __slots__ = ()
+
+    _flag = '-lfi'
+    _name = '--log-flush-interval'
+    dest = 'log_flush_interval'
+    env_name = 'TEMPLATE_PACKAGE_LOG_FLUSH_INTERVAL'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogFlushInterval._flag,
+                               LogFlushInterval._name,
+                               dest=LogFlushInterval.dest,
+                               type=float,
+                               default=1.0,
+                               help='Sets a number of seconds after which log records kept in memory are written,\n'
+                                    '0 disables periodic writes.')
+
+
+class LogFsync(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-lfs'
+    _name = '--log-fsync'
+    dest = 'log_fsync'
+    env_name = 'TEMPLATE_PACKAGE_LOG_FSYNC'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogFsync._flag,
+                               LogFsync._name,
+                               dest=LogFsync.dest,
+                               choices=['never', 'interval', 'always'],
+                               default='never',
+                               help='Sets when log files are synchronised to the disk: never, on periodic writes\n'
+                                    '(interval) or on every write (always).')
+
+
+class DebugLogRecorder(Arg, int):
+
+    __slots__ = ()
+
+    _flag = '-dlr'
+    _name = '--debug-log-recorder'
+    dest = 'debug_log_recorder'
+    env_name = 'TEMPLATE_PACKAGE_DEBUG_LOG_RECORDER'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(DebugLogRecorder._flag,
+                               DebugLogRecorder._name,
+                               dest=DebugLogRecorder.dest,
+                               type=int,
+                               default=0,
+                               help='Keeps only given number of the latest records of the debug log in memory\n'
+                                    'and writes them when an error is logged, the script fails or it receives\n'
+                                    'SIGUSR1. 0 writes all records to the debug log.')
+
+
+class LogFormat(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-lf'
+    _name = '--log-format'
+    dest = 'log_format'
+    env_name = 'TEMPLATE_PACKAGE_LOG_FORMAT'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(LogFormat._flag,
+                               LogFormat._name,
+                               dest=LogFormat.dest,
+                               choices=['text', 'json'],
+                               default='text',
+                               help='Sets format of log records: text lines or JSON lines.')
+
+
+class ConfigCache(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-cc'
+    _name = '--config-cache'
+    dest = 'config_cache'
+    env_name = 'TEMPLATE_PACKAGE_CONFIG_CACHE'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(ConfigCache._flag,
+                               ConfigCache._name,
+                               dest=ConfigCache.dest,
+                               help='Keeps snapshots of resolved arguments in given directory, so runs with\n'
+                                    'the same command line, environment and files skip parsing. Taken only\n'
+                                    'from the command line or the environment.')
+
+
+class ConfigReload(Arg, str):
+
+    __slots__ = ()
+
+    _flag = '-cr'
+    _name = '--config-reload'
+    dest = 'config_reload'
+    env_name = 'TEMPLATE_PACKAGE_CONFIG_RELOAD'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(ConfigReload._flag,
+                               ConfigReload._name,
+                               dest=ConfigReload.dest,
+                               choices=['off', 'sighup', 'poll'],
+                               default='off',
+                               help='Reloads the configuration file during the run when the script receives\n'
+                                    'SIGHUP (sighup), or also when the file changes (poll). Changed values are\n'
+                                    'validated and applied at once, the logging level included.')
+
+
+class ConfigReloadInterval(Arg, float):
+
+    __slots__ = ()
+
+    _flag = '-cri'
+    _name = '--config-reload-interval'
+    dest = 'config_reload_interval'
+    env_name = 'TEMPLATE_PACKAGE_CONFIG_RELOAD_INTERVAL'
+
+    @staticmethod
+    def add_arg(arg_group):
+        arg_group.add_argument(ConfigReloadInterval._flag,
+                               ConfigReloadInterval._name,
+                               dest=ConfigReloadInterval.dest,
+                               type=float,
+                               default=2.0,
+                               help='Sets a number of seconds between checks of the configuration file\n'
+                                    'with --config-reload poll.')
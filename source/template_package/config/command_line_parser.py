@@ -3,24 +3,42 @@
 Handles argument parsing for the script.
 """
 
-import argparse
-import json
 import logging
+import sys
+from types import SimpleNamespace
 
-from template_package.config.basic_args import LogLevel, BasicParam, LogMode
+from template_package.config.basic_args import (BasicParam, ConfigCache, ConfigFile, ConfigReload, ConfigReloadInterval,
+                                                DebugLogRecorder, Executor, LogAsync, LogBackupCount, LogBufferRecords,
+                                                LogBufferSize, LogCompression, LogFlushInterval, LogFormat, LogFsync,
+                                                LogLevel, LogMaxBytes, LogMode, LogQueueSize, LogRotateWhen,
+                                                MetricsFile, MetricsInterval, Profile, TraceFile, Workers)
 from template_package.config.common_args import CommonIntParam, CommonListParam
-from template_package.config.constants import __name__, __version__
+from template_package.config.constants import VERSION_INFO
+from template_package.config.fast_parser import FastParser
 from template_package.config.mode import Mode
 from template_package.config.mode_a_args import AModeOnlyParam
-from template_package.lib.utilities import iterable_to_string
+from template_package.lib.tracing import span
+from template_package.lib.lazy import LazyJoin, LazyJson
 
 
 class CommandLineParser:
     """Represents argument parser.
     """
 
-    def __init__(self):
+    # Arguments of the basic parser, the common parser and of specific modes.
+    _basic_args = [LogLevel, LogFormat, LogMode, LogMaxBytes, LogRotateWhen, LogBackupCount, LogCompression,
+                   LogBufferSize, LogBufferRecords, LogFlushInterval, LogFsync, DebugLogRecorder, LogAsync,
+                   LogQueueSize, ConfigFile, ConfigCache, ConfigReload, ConfigReloadInterval, BasicParam, Workers,
+                   Executor, Profile, TraceFile, MetricsFile, MetricsInterval]
+    _common_args = [CommonIntParam, CommonListParam]
+    _mode_args = {Mode.MODE_A: [AModeOnlyParam],
+                  Mode.MODE_B: []}
+    _fast_parser = None
+
+    def __init__(self, argv: list = None):
         self.params = None
+        self.explicit_params = None
+        self._argv = sys.argv[1:] if argv is None else argv
         self._parser = None
         self._subparsers = None
         self._common_parser = None
@@ -28,12 +46,16 @@ class CommandLineParser:
     def _prepare_basic_parser(self):
         """Prepares a basic parser.
         """
+        import argparse
         self._parser = argparse.ArgumentParser(description=__doc__,
                                                formatter_class=argparse.RawTextHelpFormatter,
                                                fromfile_prefix_chars='@',
                                                epilog='You can store all parameters into configuration file and pass '
                                                       'it via @file_name parameter.\nParameters should be separated '
-                                                      'via new line and should be in format --parameter-name=value.',
+                                                      'via new line and should be in format --parameter-name=value.\n'
+                                                      'Parameters can be also set via environment variables named '
+                                                      'after them with TEMPLATE_PACKAGE_ prefix,\n'
+                                                      'e.g. TEMPLATE_PACKAGE_LOG_LEVEL, or via --config-file.',
                                                add_help=False)
         # Creating an argument group is required to correctly classify arguments in the help message.
         argument_group = self._parser.add_argument_group('Basic', 'Script basic parameters.')
@@ -43,10 +65,9 @@ class CommandLineParser:
         argument_group.add_argument('-v', '--version',
                                     help='Show program\'s version number and exit.',
                                     action='version',
-                                    version='{0} {1}'.format(__name__, __version__))
-        LogLevel.add_arg(argument_group)
-        LogMode.add_arg(argument_group)
-        BasicParam.add_arg(argument_group)
+                                    version=VERSION_INFO)
+        for arg in self._basic_args:
+            arg.add_arg(argument_group)
 
     def _prepare_subparsers(self):
         """Prepares a subparsers allowing to choose a mode of script.
@@ -56,39 +77,139 @@ class CommandLineParser:
     def _prepare_common_parser(self):
         """Prepares parser including common parameters for all of the script's modes.
         """
+        import argparse
         self._common_parser = argparse.ArgumentParser(add_help=False)
         argument_group = self._common_parser.add_argument_group('Common', 'Common parameters for all script modes.')
         argument_group.add_argument('-h', '--help',
                                     action='help',
                                     help='Show this help message specific for script mode and exit.')
-        CommonIntParam.add_arg(argument_group)
-        CommonListParam.add_arg(argument_group)
+        for arg in self._common_args:
+            arg.add_arg(argument_group)
 
     def _prepare_mode_a_parser(self):
         """Prepares a parser for "a" mode with specific parameters for this mode.
         """
         self._a_mode_parser = Mode.add_mode_a_parsers(self._subparsers, parents=[self._common_parser])
         argument_group = self._a_mode_parser.add_argument_group('Mode A', 'Parameters specific for A-mode.')
-        AModeOnlyParam.add_arg(argument_group)
+        for arg in self._mode_args[Mode.MODE_A]:
+            arg.add_arg(argument_group)
 
     def _prepare_mode_b_parser(self):
         """Prepares a parser for "b" mode with specific parameters for this mode.
         """
         self._b_mode_parser = Mode.add_mode_b_parsers(self._subparsers, parents=[self._common_parser])
 
-    def prepare_parser(self):
+    # Builders of mode specific parsers. A new mode has to be registered here.
+    _mode_parsers = {Mode.MODE_A: _prepare_mode_a_parser,
+                     Mode.MODE_B: _prepare_mode_b_parser}
+
+    def _selected_mode(self):
+        """Finds a mode requested in the command line without parsing it.
+
+        Returns
+        -------
+        str
+            A name of the requested mode or None if it can't be told for sure,
+            e.g. the main help is requested or the arguments are read from a file.
+        """
+        value_options = {option for option, action in self._parser._option_string_actions.items()
+                         if action.nargs != 0}
+        long_value_options = [option for option in value_options if option.startswith('--')]
+        tokens = iter(self._argv)
+        for token in tokens:
+            if token == '--':
+                token = next(tokens, None)
+            elif token.startswith('@') or token in ('-h', '--help'):
+                return None
+            elif token.startswith('-') and len(token) > 1:
+                if token in value_options:
+                    next(tokens, None)
+                elif token.startswith('--'):
+                    name = token.split('=', 1)[0]
+                    matches = [option for option in long_value_options if option.startswith(name)]
+                    if name not in value_options and len(matches) != 1:
+                        return None
+                    if '=' not in token:
+                        next(tokens, None)
+                elif token[:2] not in value_options:
+                    return None
+                continue
+            return token if token in self._mode_parsers else None
+        return None
+
+    def prepare_parser(self, all_modes: bool = False):
         """Prepares commandline parser.
+
+        Only a parser of the mode given in the command line is built, unless all_modes is True.
+        Parsers of all modes are built if the mode can't be told before parsing, e.g. the main help is requested,
+        and when an error is reported, so the usage lists all modes.
         """
         self._prepare_basic_parser()
         self._prepare_subparsers()
         self._prepare_common_parser()
-        self._prepare_mode_a_parser()
-        self._prepare_mode_b_parser()
+        mode = None if all_modes else self._selected_mode()
+        for name, prepare_mode_parser in self._mode_parsers.items():
+            if mode is None or name == mode:
+                prepare_mode_parser(self)
+        if mode is not None:
+            self._parser.error = self._error
+
+    def _error(self, message: str):
+        """Reports an error of the basic parser by a parser with all modes built and exits.
+        """
+        parser = CommandLineParser(self._argv)
+        parser.prepare_parser(all_modes=True)
+        parser._parser.error(message)
+
+    @property
+    def fast_parser(self) -> FastParser:
+        """The fast parser compiled from the arguments of the parser.
+        """
+        return self._get_fast_parser()
+
+    @classmethod
+    def _get_fast_parser(cls) -> FastParser:
+        """Returns a fast parser compiled from the arguments of the class, compiling it once.
+        """
+        if cls.__dict__.get('_fast_parser') is None:
+            cls._fast_parser = FastParser(cls._basic_args, cls._common_args, cls._mode_args)
+        return cls._fast_parser
+
+    def _suppress_defaults(self):
+        """Makes argparse leave out arguments which aren't given, defaults are applied after parsing.
+        """
+        import argparse
+        parsers = [self._parser] + list(self._subparsers.choices.values())
+        for parser in parsers:
+            for action in parser._actions:
+                action.default = argparse.SUPPRESS
 
     def parse(self):
         """Parses input parameters.
+
+        A well-formed command line is parsed by the fast parser, argparse parser is built and used
+        only if the fast parser can't handle the input, e.g. help is requested or the input is invalid.
+        Values given explicitly are kept in explicit_params, params contain also default values.
+        A source of list argument values ("@-" or "@path") is given as StreamValues, see arg_file module.
         """
-        self.params, unknown_args = self._parser.parse_known_args()
-        logging.debug('Raw parsed arguments:\n%s.', json.dumps(self.params.__dict__, indent=4, separators=(';', ': ')))
+        fast_parser = self._get_fast_parser()
+        argv, sources = fast_parser.take_list_sources(self._argv)
+        self.explicit_params = fast_parser.parse_explicit(argv)
+        unknown_args = None
+        if self.explicit_params is None:
+            with span('parser.prepare_parser'):
+                if self._parser is None:
+                    self.prepare_parser()
+                self._suppress_defaults()
+            with span('parser.argparse'):
+                namespace, unknown_args = self._parser.parse_known_args(argv)
+            self.explicit_params = namespace.__dict__
+        for dest, value in self.explicit_params.items():
+            if isinstance(value, list) and len(value) == 1 and value[0] in sources:
+                self.explicit_params[dest] = sources[value[0]]
+        params = fast_parser.initial_values(self.explicit_params.get(Mode.dest))
+        params.update(self.explicit_params)
+        self.params = SimpleNamespace(**params)
+        logging.debug('Raw parsed arguments:\n%s.', LazyJson(params, indent=4, separators=(';', ': '), default=repr))
         if unknown_args:
-            logging.warning('Ignored arguments:\n[%s].', iterable_to_string(con=unknown_args, sep=',\n', wrap="'"))
+            logging.warning('Ignored arguments:\n[%s].', LazyJoin(con=unknown_args, sep=',\n', wrap="'"))
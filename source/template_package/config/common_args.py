@@ -6,9 +6,12 @@ from template_package.config.arg import Arg
 
 class CommonIntParam(Arg, int):
 
+    __slots__ = ()
+
     _flag = '-ci'
     _name = '--common-int-param'
     dest = 'common_int_param'
+    env_name = 'TEMPLATE_PACKAGE_COMMON_INT_PARAM'
 
     @staticmethod
     def add_arg(arg_group):
@@ -21,18 +24,23 @@ class CommonIntParam(Arg, int):
 
 class CommonListParam(Arg, list):
 
+    __slots__ = ()
+
     _flag = '-cl'
     _name = '--common-list-param'
     dest = 'common_list_param'
-
-    def __init__(self, value):
-        Arg.__init__(self, value)
-        list.__init__(self, value)
+    env_name = 'TEMPLATE_PACKAGE_COMMON_LIST_PARAM'
+    # Set to int, float or bytes to keep the values in a compact array instead of a list of strings.
+    element_type = None
 
     @staticmethod
     def add_arg(arg_group):
+        element_help = (f'\nValues are {CommonListParam.element_type} elements kept in a compact array.'
+                        if CommonListParam.element_type is not None else '')
         arg_group.add_argument(CommonListParam._flag,
                                CommonListParam._name,
                                dest=CommonListParam.dest,
                                nargs='+',
-                               help='Set a common list parameter.')
+                               help='Set a common list parameter.\n'
+                                    'Values are read line by line from the standard input or a file if "@-" or\n'
+                                    '"@path" is the only value.' + element_help)
@@ -3,31 +3,75 @@
 It controls script basic configuration.
 """
 
-import json
 import logging
+import os
 import sys
+import threading
 import time
 
 from template_package.config.command_line_parser import CommandLineParser
 from template_package.config.args import Args
-from template_package.config.constants import LOG_FILE_PATH, DEBUG_LOG_FILE_PATH, __name__, __version__
+from template_package.config import constants
+from template_package.config.basic_args import (ConfigCache, ConfigFile, ConfigReload, ConfigReloadInterval,
+                                                DebugLogRecorder, LogAsync, LogBackupCount, LogBufferRecords,
+                                                LogBufferSize, LogCompression, LogFlushInterval, LogFormat, LogFsync,
+                                                LogLevel, LogMaxBytes, LogMode, LogRotateWhen, MetricsFile)
+from template_package.config.config_file_parser import ConfigFileParser
+from template_package.config.config_reloader import ConfigReloader
+from template_package.config.environment_parser import EnvironmentParser
+from template_package.config.layered_resolver import LayeredResolver
+from template_package.config.snapshot_cache import SnapshotCache
+from template_package.config.constants import __name__, __version__
+from template_package.lib.lazy import LazyJson
 from template_package.lib.logger import Logger
+from template_package.lib.metrics import MetricsWriter, metrics
+from template_package.lib.tracing import span
 
 args = None
 
 
 class Config:
     """Class handles the script basic configuration.
+
+    Keyword arguments
+    -----------------
+    argv: list
+        Command line arguments, without the program name. Taken from sys.argv by default.
+    non_blocking_logging: bool
+        If True and --log-async isn't given, records are queued and written by a background thread,
+        so logging calls don't wait for the sinks. The queue blocks when full, as with --log-async block.
+        A policy given with --log-async, including off, is kept.
     """
 
-    def __init__(self):
+    def __init__(self, argv: list = None, non_blocking_logging: bool = False):
         self._start_time = time.time()
+        self._argv = argv
+        self._non_blocking_logging = non_blocking_logging
         self._logger = None
         self._arg_parser = None
-        self._init_logger()
-        self.args = Args()
-        self._init_arg_parser()
-        self._config_logger()
+        self._environment_params = None
+        self._config_file_cache = None
+        self._metrics_writer = None
+        self.args = None
+        self.snapshot_path = None
+        self._resolved_values = None
+        self._reload_lock = threading.Lock()
+        self._reload_listeners = []
+        self._reloader = None
+        with span('config'):
+            with span('config.init_logger'):
+                self._init_logger()
+            try:
+                with span('config.resolve'):
+                    self._init_arg_parser()
+            finally:
+                with span('config.config_log_files'):
+                    self._config_log_files()
+            with span('config.config_logger'):
+                self._config_logger()
+        duration = time.time() - self._start_time
+        metrics.gauge('config_duration_seconds', 'Duration of the script configuration.').set(duration)
+        logging.debug('Configuration took %.3fs.', duration)
 
     def _init_logger(self):
         """Performs basic logger configuration prior to setting up configuration.
@@ -35,9 +79,12 @@ class Config:
         # TODO: How to configure logging cross-modules?
         self._logger = Logger()
         self._logger.set_level('INFO')
+        # Records printed before the arguments are resolved already follow the requested format.
+        if LogFormat.peek(sys.argv[1:] if self._argv is None else self._argv) == 'json':
+            self._logger.set_format('json')
         self._logger.config_stdout_handler()
-        self._logger.config_log_file_handler(LOG_FILE_PATH)
-        self._logger.config_debug_log_file_handler(DEBUG_LOG_FILE_PATH)
+        # Log files are opened once their mode and rotation are known, records are kept until then.
+        self._logger.buffer_records()
         logging.info('%s (%s) started on %s.',
                      __name__,
                      __version__,
@@ -51,14 +98,274 @@ class Config:
     def _init_arg_parser(self):
         """Retrieves arguments use in the script.
         """
-        self._arg_parser = CommandLineParser()
-        self._arg_parser.prepare_parser()
-        self._arg_parser.parse()
-        self.args.set_args(self._arg_parser.params.__dict__)
+        try:
+            self.args = self.resolve(self._argv)
+        except (OSError, ValueError) as exception:
+            logging.error('Configuration error: %s.', exception)
+            sys.exit(2)
+        # Kept apart from the arguments, which the modes may change, to tell what a reload changes.
+        self._resolved_values = self._snapshot(self.args)
         logging.debug('All parsed parameters (input values):\n%s.',
-                      json.dumps(self.args, indent=4, separators=(';', ': ')))
+                      LazyJson(self.args.as_dict(), indent=4, separators=(';', ': '), default=repr))
+        logging.debug('Sources of parameters:\n%s.', LazyJson(self.args.sources(), indent=4, separators=(';', ': ')))
+
+    @staticmethod
+    def _snapshot(args: Args) -> dict:
+        """Returns values of the arguments with lists copied, so changes made by the modes aren't seen there.
+        """
+        return {dest: list(value) if isinstance(value, list) else value for dest, value in args.items()}
+
+    def _read_config_file(self, path: str) -> dict:
+        """Returns raw values from the configuration file, the file is read again only if it has changed.
+        """
+        key = (path, os.stat(path).st_mtime_ns)
+        if self._config_file_cache is None or self._config_file_cache[0] != key:
+            config_file_parser = ConfigFileParser(path, Args._arg_class)
+            config_file_parser.parse()
+            self._config_file_cache = (key, config_file_parser.params)
+        return self._config_file_cache[1]
+
+    def resolve(self, argv: list = None) -> Args:
+        """Resolves a command line into script arguments.
+
+        Values given in the command line take precedence over environment variables,
+        which take precedence over the configuration file. The parser, the environment
+        and the last configuration file read are shared by subsequent calls. If a snapshot
+        directory is given, resolved values are stored there and loaded by later calls
+        with the same input, see snapshot_cache module.
+
+        Parameters
+        ----------
+        argv: list
+            Command line arguments, without the program name. Taken from sys.argv by default.
+
+        Returns
+        -------
+        Args
+            Resolved arguments.
+
+        Raises
+        ------
+        OSError
+            If the configuration file can't be read.
+        ValueError
+            If a value from the environment or the configuration file is invalid.
+        SystemExit
+            If the command line is invalid or help is requested.
+        """
+        start_time = time.perf_counter()
+        argv = sys.argv[1:] if argv is None else argv
+        if self._environment_params is None:
+            with span('config.parse_environment'):
+                environment_parser = EnvironmentParser(Args._arg_class)
+                environment_parser.parse()
+                self._environment_params = environment_parser.params
+        cache_directory = ConfigCache.peek(argv)
+        cache = SnapshotCache(cache_directory) if cache_directory else None
+        key = cache.key(argv, self._environment_params) if cache is not None else None
+        with span('config.load_snapshot'):
+            snapshot = cache.load(key) if cache is not None else None
+        if snapshot is not None:
+            values, sources = snapshot
+            self.snapshot_path = cache.path(key)
+            logging.debug('Arguments loaded from snapshot %s.', self.snapshot_path)
+        else:
+            with span('config.parse_command_line'):
+                self._arg_parser = CommandLineParser(argv)
+                self._arg_parser.parse()
+            config_file = (self._arg_parser.explicit_params.get(ConfigFile.dest)
+                           or self._environment_params.get(ConfigFile.dest))
+            with span('config.read_config_file'):
+                config_file_params = self._read_config_file(config_file) if config_file else {}
+            with span('config.resolve_layers'):
+                values, sources = LayeredResolver(self._arg_parser.fast_parser).resolve(
+                    self._arg_parser.explicit_params, self._environment_params, config_file_params)
+            self.snapshot_path = None
+            if cache is not None:
+                with span('config.store_snapshot'):
+                    self.snapshot_path = self._store_snapshot(cache, key, values, sources, argv, config_file)
+        with span('config.set_args'):
+            args = Args()
+            args.set_args(values, sources)
+        metrics.histogram('config_resolve_duration_seconds', 'Duration of resolving a command line into arguments.',
+                          buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+                          ).observe(time.perf_counter() - start_time)
+        return args
+
+    @staticmethod
+    def _store_snapshot(cache: SnapshotCache, key: tuple, values: dict, sources: dict, argv: list,
+                        config_file: str):
+        """Stores a snapshot of resolved values, returns its path or None if they can't be stored.
+        """
+        try:
+            path = cache.store(key, values, sources, argv, config_file)
+        except ValueError as exception:
+            logging.info('Arguments can\'t be stored in a snapshot: %s.', exception)
+            return None
+        except OSError as exception:
+            logging.warning('Snapshot of arguments could not be stored: %s.', exception)
+            return None
+        logging.debug('Arguments stored in snapshot %s.', path)
+        return path
+
+    def _config_log_files(self):
+        """Sets up log files handlers and writes the records logged so far.
+        If the arguments couldn't be resolved, the files are appended to, so previous logs are kept.
+        """
+        args = self.args if self.args is not None else {LogMode.dest: 'a'}
+        self._logger.set_format(args.get(LogFormat.dest, 'text'))
+        self._logger.config_rotation(max_bytes=args.get(LogMaxBytes.dest, 0),
+                                     when=args.get(LogRotateWhen.dest),
+                                     backup_count=args.get(LogBackupCount.dest, 0),
+                                     compress=args.get(LogCompression.dest) != 'none')
+        self._logger.config_flush_policy(buffer_bytes=args.get(LogBufferSize.dest, 0),
+                                         buffer_records=args.get(LogBufferRecords.dest, 0),
+                                         flush_interval=args.get(LogFlushInterval.dest, 0),
+                                         fsync=args.get(LogFsync.dest, 'never'))
+        self._logger.config_log_file_handler(constants.LOG_FILE_PATH, args.get(LogMode.dest))
+        self._logger.config_debug_log_file_handler(constants.DEBUG_LOG_FILE_PATH, args.get(LogMode.dest),
+                                                   args.get(DebugLogRecorder.dest, 0))
+        self._logger.flush_buffered_records()
 
     def _config_logger(self):
         """Perform addition logger configuration after retrieving script arguments.
         """
         self._logger.set_level(self.args.log_level)
+        policy = self.args.log_async
+        if self._non_blocking_logging and self.args.source(LogAsync.dest) == LayeredResolver.DEFAULT:
+            # The sinks are moved behind the queue, but no record is dropped unless the user chose so.
+            policy = 'block'
+        if policy != 'off':
+            self._logger.enable_async(queue_size=self.args.log_queue_size, policy=policy)
+        if self.args.get(MetricsFile.dest):
+            self._logger.enable_metrics(metrics)
+            self._metrics_writer = MetricsWriter(metrics, self.args.metrics_file, self.args.metrics_interval)
+            self._metrics_writer.start()
+
+    def install_signal_handlers(self):
+        """Makes SIGTERM close logging sinks, writing buffered records, before the process terminates
+        and SIGUSR1 write the debug records kept in memory. To be called in the main thread,
+        signal handlers can't be installed in other threads.
+        """
+        self._logger.close_on_termination()
+        self._logger.dump_debug_records_on_signal()
+
+    def add_reload_listener(self, listener):
+        """Registers a function called after the configuration is reloaded with changed values,
+        see reload method.
+
+        Parameters
+        ----------
+        listener: Callable
+            A function taking the new arguments and their changes (old and new values keyed by destination).
+            It's called in the thread reloading the configuration.
+        """
+        self._reload_listeners.append(listener)
+
+    def start_reloader(self):
+        """Starts reloading the configuration file as set with --config-reload. To be called in the main thread,
+        so SIGHUP can be handled.
+        """
+        policy = self.args.get(ConfigReload.dest, 'off')
+        if policy == 'off' or self._reloader is not None:
+            return
+        config_file = self.args.get(ConfigFile.dest)
+        if not config_file:
+            logging.warning('Configuration reload is requested but there is no configuration file.')
+            return
+        interval = self.args.config_reload_interval if policy == 'poll' else 0
+        self._reloader = ConfigReloader(self, config_file, interval)
+        self._reloader.start()
+        logging.debug('Reloading configuration file %s (%s).', config_file, policy)
+
+    def reload(self) -> dict:
+        """Resolves the arguments again with the configuration file as it is now and applies changed values.
+
+        The command line and the environment are taken as they were at start, so only values coming from
+        the configuration file may change. The new values are validated like at start and if any of them
+        is invalid, nothing is applied. Otherwise the arguments are swapped at once for new ones, the logging
+        level is set and reload listeners are called. Arguments read only at start, e.g. log files settings
+        or the number of workers, take effect in the next run.
+
+        Returns
+        -------
+        dict
+            Old and new values of changed arguments keyed by destination, empty if nothing has changed.
+
+        Raises
+        ------
+        OSError
+            If the configuration file can't be read.
+        ValueError
+            If a value from the configuration file is invalid.
+        """
+        with self._reload_lock:
+            if self._arg_parser is None:
+                # The arguments were loaded from a snapshot, the command line is parsed only now.
+                self._arg_parser = CommandLineParser(self._argv)
+                self._arg_parser.parse()
+            explicit_params = self._arg_parser.explicit_params
+            config_file = explicit_params.get(ConfigFile.dest) or self._environment_params.get(ConfigFile.dest)
+            config_file_params = self._read_config_file(config_file) if config_file else {}
+            values, sources = LayeredResolver(self._arg_parser.fast_parser).resolve(
+                explicit_params, self._environment_params, config_file_params)
+            args = Args()
+            args.set_args(values, sources)
+            new_values = self._snapshot(args)
+            changes = {dest: (self._resolved_values.get(dest), new_values.get(dest))
+                       for dest in {**self._resolved_values, **new_values}
+                       if self._resolved_values.get(dest) != new_values.get(dest)}
+            if not changes:
+                return changes
+            self.args = args
+            self._resolved_values = new_values
+            if LogLevel.dest in changes:
+                self._logger.set_level(args.log_level)
+            listeners = list(self._reload_listeners)
+        for listener in listeners:
+            try:
+                listener(args, changes)
+            except Exception:
+                logging.exception('Configuration reload listener %r failed.', listener)
+        return changes
+
+    @classmethod
+    async def create_async(cls, argv: list = None) -> 'Config':
+        """Creates the configuration in a separate thread, so the event loop isn't blocked by file I/O.
+        Unless --log-async is given, logging sinks of the created configuration are written
+        by a background thread, see non_blocking_logging.
+
+        Parameters
+        ----------
+        argv: list
+            Command line arguments, without the program name. Taken from sys.argv by default.
+
+        Returns
+        -------
+        Config
+            The configuration.
+        """
+        import asyncio
+        return await asyncio.to_thread(cls, argv, non_blocking_logging=True)
+
+    def close(self, failed: bool = False):
+        """Writes the metrics file, flushes and closes logging sinks, to be called when the script finishes.
+
+        Parameters
+        ----------
+        failed: bool
+            True if the script failed, the debug records kept in memory are written then.
+        """
+        if self._reloader is not None:
+            self._reloader.stop()
+            self._reloader = None
+        if self._metrics_writer is not None:
+            self._metrics_writer.stop()
+            self._metrics_writer = None
+        self._logger.close(dump_debug_records=failed)
+
+    async def close_async(self, failed: bool = False):
+        """Flushes and closes logging sinks in a separate thread, so the event loop isn't blocked.
+        """
+        import asyncio
+        await asyncio.to_thread(self.close, failed)
@@ -0,0 +1,75 @@
+"""ConfigFileParser class implementation.
+
+Reads argument values from INI or TOML configuration file.
+"""
+
+import logging
+import os
+
+
+class ConfigFileParser:
+    """Represents configuration file parser.
+
+    Keys are argument names without leading dashes (e.g. "log-level") or argument destinations
+    (e.g. "log_level"). Sections (tables) are used only to group keys, their names don't matter.
+    A file with ".toml" extension is read as TOML, any other as INI.
+
+    Keyword arguments
+    -----------------
+    path: os.PathLike
+        A path to the configuration file.
+    arg_classes: list
+        Arguments used in the script.
+    """
+
+    def __init__(self, path: os.PathLike, arg_classes: list):
+        self.params = None
+        self._path = path
+        self._index = {}
+        for arg in arg_classes:
+            self._index[arg.dest] = arg.dest
+            if getattr(arg, '_name', None):
+                self._index[arg._name.lstrip('-')] = arg.dest
+
+    def _read_ini(self):
+        import configparser
+        parser = configparser.ConfigParser(interpolation=None)
+        with open(self._path, encoding='utf-8') as file:
+            try:
+                parser.read_file(file)
+            except configparser.Error as exception:
+                raise ValueError(str(exception)) from exception
+        for section in [parser.default_section] + parser.sections():
+            yield from parser[section].items()
+
+    def _read_toml(self):
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open(self._path, 'rb') as file:
+            data = tomllib.load(file)
+        for key, value in data.items():
+            if isinstance(value, dict):
+                yield from value.items()
+            else:
+                yield key, value
+
+    def parse(self):
+        """Reads raw values of arguments from the file, keyed by argument destination.
+
+        Raises
+        ------
+        OSError
+            If the file can't be read.
+        ValueError
+            If the file content is invalid.
+        """
+        entries = self._read_toml() if str(self._path).endswith('.toml') else self._read_ini()
+        self.params = {}
+        for key, value in entries:
+            dest = self._index.get(key)
+            if dest is None:
+                logging.debug('Ignored unknown key "%s" of configuration file %s.', key, self._path)
+                continue
+            self.params[dest] = value
@@ -0,0 +1,99 @@
+"""ConfigReloader class implementation.
+
+Reloads the configuration file of a running script from a background thread, so the workers aren't paused,
+when the script receives SIGHUP or, if polling is enabled, when the file's modification time or size changes.
+"""
+
+import logging
+import os
+import threading
+
+from template_package.lib.lazy import LazyJson
+
+
+class ConfigReloader:
+    """Represents a watcher of the configuration file.
+
+    Keyword arguments
+    -----------------
+    config: Config
+        The configuration reloaded, see Config.reload.
+    path: os.PathLike
+        A path of the configuration file.
+    interval: float
+        A number of seconds between checks of the file, 0 means reloading only on SIGHUP.
+    """
+
+    def __init__(self, config, path: os.PathLike, interval: float = 0):
+        self._config = config
+        self._path = path
+        self._interval = interval
+        self._requested = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._previous_handler = None
+
+    def _file_state(self):
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _run(self):
+        state = self._file_state()
+        while True:
+            requested = self._requested.wait(self._interval or None)
+            if self._stopped.is_set():
+                return
+            self._requested.clear()
+            new_state = self._file_state()
+            if requested or new_state != state:
+                state = new_state
+                try:
+                    self._reload()
+                except Exception:
+                    # The watcher keeps running, so a later edit or SIGHUP is still applied.
+                    logging.exception('Configuration could not be reloaded, the current one is kept.')
+
+    def _reload(self):
+        try:
+            changes = self._config.reload()
+        except (OSError, ValueError) as exception:
+            logging.error('Configuration could not be reloaded, the current one is kept: %s.', exception)
+            return
+        if changes:
+            logging.info('Configuration reloaded, changed arguments (old, new values):\n%s.',
+                         LazyJson(changes, indent=4, separators=(';', ': '), default=repr))
+        else:
+            logging.info('Configuration reloaded, no argument has changed.')
+
+    def request(self):
+        """Makes the watcher reload the configuration file, e.g. from a signal handler.
+        """
+        self._requested.set()
+
+    def start(self):
+        """Starts watching. SIGHUP handler is installed only in the main thread,
+        if the signal isn't already handled by the script.
+        """
+        import signal
+        if (threading.current_thread() is threading.main_thread()
+                and signal.getsignal(signal.SIGHUP) is signal.SIG_DFL):
+            self._previous_handler = signal.signal(signal.SIGHUP, lambda signum, frame: self.request())
+        self._thread = threading.Thread(target=self._run, name='ConfigReloader', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops watching. SIGHUP handling is restored if it's called in the main thread,
+        otherwise the handler is left, requesting nothing more.
+        """
+        if self._previous_handler is not None and threading.current_thread() is threading.main_thread():
+            import signal
+            signal.signal(signal.SIGHUP, self._previous_handler)
+            self._previous_handler = None
+        self._stopped.set()
+        self._requested.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -2,7 +2,6 @@
 """
 
 import os
-from pathlib import Path
 
 # ------
 # Basic.
@@ -13,13 +12,23 @@ __version__ = '0.1.0'
 __author__ = 'kryspinzakaska'
 SCRIPT_NAME_FORMATTED = __name__.lower().replace(" ", "_")
 FILE_NAME = "_".join(__name__.lower().split())
+VERSION_INFO = f"{__name__} {__version__}"
 
 # -----------------
 # Logging specific.
 # -----------------
 
-LOG_FILE_PATH = Path(os.getcwd(), f"{SCRIPT_NAME_FORMATTED}.log")
-DEBUG_LOG_FILE_PATH = Path(os.getcwd(), f"{SCRIPT_NAME_FORMATTED}_debug.log")
 BASIC_FORMAT = "%(asctime)s %(levelname)-8s %(message)s"
 DEBUG_FORMAT = "%(asctime)s %(levelname)-8s [%(module)s | %(funcName)s | %(lineno)d]  %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def __getattr__(name):
+    """Creates log-file paths on first use, so pathlib is imported only when the log-files are opened.
+    """
+    if name in ('LOG_FILE_PATH', 'DEBUG_LOG_FILE_PATH'):
+        from pathlib import Path
+        globals()['LOG_FILE_PATH'] = Path(os.getcwd(), f"{SCRIPT_NAME_FORMATTED}.log")
+        globals()['DEBUG_LOG_FILE_PATH'] = Path(os.getcwd(), f"{SCRIPT_NAME_FORMATTED}_debug.log")
+        return globals()[name]
+    raise AttributeError(f"module 'template_package.config.constants' has no attribute '{name}'")
@@ -0,0 +1,265 @@
+"""FastParser class implementation.
+
+Parses a well-formed command line in a single pass, without building argparse parsers.
+"""
+
+from types import SimpleNamespace
+
+from template_package.config.arg_file import FileValues, StreamValues, read_arg_file
+from template_package.config.mode import Mode
+
+
+class ArgSpec:
+    """Parsing rules of a single argument, recorded from its add_arg method.
+    """
+
+    __slots__ = ('dest', 'type', 'choices', 'default', 'nargs', 'supported')
+
+    # Keywords of add_argument which are irrelevant for parsing of a valid input.
+    _IGNORED_KEYWORDS = {'dest', 'type', 'choices', 'default', 'nargs', 'help', 'metavar'}
+
+    def __init__(self, kwargs: dict):
+        self.dest = kwargs['dest']
+        self.type = kwargs.get('type')
+        self.choices = kwargs.get('choices')
+        self.default = kwargs.get('default')
+        self.nargs = kwargs.get('nargs')
+        self.supported = self.nargs in (None, '+') and kwargs.keys() <= self._IGNORED_KEYWORDS
+
+    def convert(self, string: str):
+        """Converts a command line string into the argument value.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by the type callable, or ValueError if the value isn't a valid choice.
+        """
+        value = self.type(string) if self.type is not None else string
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"invalid choice: {value!r}")
+        return value
+
+    def initial_value(self):
+        """Returns the value used when the argument isn't given, the same way argparse does.
+        """
+        if isinstance(self.default, str) and self.type is not None:
+            return self.type(self.default)
+        return self.default
+
+
+class _ArgRecorder:
+    """Stands for an argparse argument group and records arguments added to it.
+    """
+
+    def __init__(self):
+        self.specs = {}
+
+    def add_argument(self, *option_strings, **kwargs):
+        spec = ArgSpec(kwargs)
+        for option_string in option_strings:
+            self.specs[option_string] = spec
+
+
+class FastParser:
+    """Represents a fast command line parser.
+
+    A dispatch table is compiled from add_arg methods of given arguments, so it accepts exactly
+    the same options as the argparse parser built from them. Any input which the table can't handle
+    with certainty (help, version, abbreviations, invalid values, unknown arguments) makes the parser give up
+    and return None, so the full argparse parser is used instead. @file arguments are read by a streaming reader,
+    which leaves values of list arguments in the file, see arg_file module.
+
+    Keyword arguments
+    -----------------
+    basic_args: list
+        Arguments preceding the mode.
+    common_args: list
+        Arguments common for all modes.
+    mode_args: dict
+        Arguments specific for modes, keyed by mode name.
+    """
+
+    def __init__(self, basic_args: list, common_args: list, mode_args: dict):
+        self._basic_table = self._compile(basic_args)
+        self._mode_tables = {mode: self._compile(common_args + args) for mode, args in mode_args.items()}
+        self._list_specs = {option: spec for table in [self._basic_table, *self._mode_tables.values()]
+                            for option, spec in table.items() if spec.nargs == '+'}
+
+    @staticmethod
+    def _compile(args: list) -> dict:
+        """Compiles a dispatch table mapping option strings to parsing rules.
+        """
+        recorder = _ArgRecorder()
+        for arg in args:
+            arg.add_arg(recorder)
+        return recorder.specs
+
+    @property
+    def modes(self) -> list:
+        """Names of the modes known to the parser.
+        """
+        return list(self._mode_tables)
+
+    def specs(self, mode: str = None) -> dict:
+        """Returns parsing rules of arguments accepted together with given mode, keyed by destination.
+        """
+        tables = [self._basic_table, self._mode_tables.get(mode, {})]
+        return {spec.dest: spec for table in tables for spec in table.values()}
+
+    def initial_values(self, mode: str = None) -> dict:
+        """Returns values of arguments which aren't given, in the same order as argparse namespace has them.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by a type callable while converting a default value.
+        """
+        values = {spec.dest: spec.initial_value() for spec in self._basic_table.values()}
+        values[Mode.dest] = mode
+        for spec in self._mode_tables.get(mode, {}).values():
+            values[spec.dest] = spec.initial_value()
+        return values
+
+    def parse(self, argv: list):
+        """Parses given command line.
+
+        Parameters
+        ----------
+        argv: list
+            Command line arguments, without the program name.
+
+        Returns
+        -------
+        SimpleNamespace
+            Parsed values, equal to the namespace returned by argparse, or None if the input has to be
+            parsed by argparse.
+        """
+        explicit = self.parse_explicit(argv)
+        if explicit is None:
+            return None
+        try:
+            params = self.initial_values(explicit.get(Mode.dest))
+        except Exception:
+            return None
+        params.update(explicit)
+        return SimpleNamespace(**params)
+
+    def take_list_sources(self, argv: list) -> tuple:
+        """Replaces sources of list argument values ("@-" or "@path" as the only value) with placeholders.
+
+        Placeholders are plain values for both parsers, parsed values equal to [placeholder] are then
+        replaced with StreamValues. Arguments converting their values can't be given a source.
+
+        Parameters
+        ----------
+        argv: list
+            Command line arguments, without the program name.
+
+        Returns
+        -------
+        tuple
+            The command line with placeholders and StreamValues keyed by placeholder.
+
+        Raises
+        ------
+        OSError
+            If a source file can't be opened.
+        """
+        argv = list(argv)
+        sources = {}
+        for i in range(len(argv) - 1):
+            spec = self._list_specs.get(argv[i])
+            if (spec is None or spec.type is not None or spec.choices is not None or not argv[i + 1].startswith('@')
+                    or i + 2 < len(argv) and not argv[i + 2].startswith('-')):
+                continue
+            # A command line argument can't contain a null character, so the placeholder can't be a real value.
+            placeholder = f'\0{len(sources)}'
+            sources[placeholder] = StreamValues(argv[i + 1][1:])
+            argv[i + 1] = placeholder
+        return argv, sources
+
+    def parse_explicit(self, argv: list):
+        """Parses given command line, returning only the values given explicitly.
+
+        Parameters
+        ----------
+        argv: list
+            Command line arguments, without the program name.
+
+        Returns
+        -------
+        dict
+            Explicitly given values keyed by destination or None if the input has to be parsed by argparse.
+        """
+        if any(token.startswith('@') for token in argv):
+            try:
+                argv = self._read_arg_files(argv)
+            except (OSError, ValueError):
+                return None
+        table = self._basic_table
+        explicit = {}
+        mode = None
+        i = 0
+        argv_len = len(argv)
+        while i < argv_len:
+            token = argv[i]
+            i += 1
+            if token.startswith('-'):
+                explicit_value = None
+                spec = table.get(token)
+                if spec is None and '=' in token:
+                    token, explicit_value = token.split('=', 1)
+                    spec = table.get(token)
+                if spec is None or not spec.supported:
+                    return None
+                if explicit_value is None and i < argv_len and isinstance(argv[i], FileValues):
+                    # Values kept in an argument file, argparse would join them with values following the file.
+                    i += 1
+                    if i < argv_len and not argv[i].startswith('-'):
+                        return None
+                    explicit[spec.dest] = argv[i - 1]
+                    continue
+                if explicit_value is not None:
+                    values = [explicit_value]
+                else:
+                    start = i
+                    if spec.nargs == '+':
+                        while i < argv_len and not argv[i].startswith('-'):
+                            i += 1
+                    elif i < argv_len and not argv[i].startswith('-'):
+                        i += 1
+                    values = argv[start:i]
+                    if not values:
+                        return None
+                try:
+                    if spec.nargs == '+':
+                        explicit[spec.dest] = [spec.convert(value) for value in values]
+                    else:
+                        explicit[spec.dest] = spec.convert(values[0])
+                except Exception:
+                    return None
+            elif mode is None and token in self._mode_tables:
+                mode = token
+                explicit[Mode.dest] = mode
+                table = self._mode_tables[mode]
+            else:
+                return None
+        return explicit
+
+    def _read_arg_files(self, argv: list) -> list:
+        """Replaces @file arguments with arguments read from the files.
+
+        Raises
+        ------
+        OSError
+            If a file can't be read.
+        ValueError
+            If a file can't be decoded.
+        """
+        tokens = []
+        for token in argv:
+            if token.startswith('@'):
+                tokens.extend(read_arg_file(token[1:], self._list_specs))
+            else:
+                tokens.append(token)
+        return tokens
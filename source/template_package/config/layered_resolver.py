@@ -0,0 +1,94 @@
+"""LayeredResolver class implementation.
+
+Merges argument values coming from different sources.
+"""
+
+import logging
+
+from template_package.config.fast_parser import ArgSpec, FastParser
+from template_package.config.mode import Mode
+
+
+class LayeredResolver:
+    """Resolves argument values from layers: command line, environment, configuration file and defaults.
+
+    A value from a layer takes precedence over values from layers listed after it.
+    Values of the environment and file layers are validated by the same rules as the command line ones.
+
+    Keyword arguments
+    -----------------
+    fast_parser: FastParser
+        A parser providing parsing rules and default values of arguments.
+    """
+
+    CLI = 'cli'
+    ENVIRONMENT = 'env'
+    FILE = 'file'
+    DEFAULT = 'default'
+
+    def __init__(self, fast_parser: FastParser):
+        self._fast_parser = fast_parser
+
+    @staticmethod
+    def _convert(spec: ArgSpec, value):
+        """Converts a raw value from the environment or a file the same way the command line value is.
+        Lists are given as values separated by white spaces, shell-like quoting can be used.
+        """
+        if spec.nargs == '+':
+            if isinstance(value, str):
+                import shlex
+                value = shlex.split(value)
+            if not value:
+                raise ValueError('expected at least one value')
+            return [spec.convert(str(item)) for item in value]
+        return spec.convert(str(value))
+
+    def resolve(self, cli: dict, environment: dict, config_file: dict):
+        """Merges the layers.
+
+        Parameters
+        ----------
+        cli: dict
+            Values given explicitly in the command line, already converted.
+        environment: dict
+            Raw values from environment variables.
+        config_file: dict
+            Raw values from the configuration file.
+
+        Returns
+        -------
+        tuple
+            A dictionary of argument values and a dictionary of layers the values come from,
+            both keyed by argument destination.
+
+        Raises
+        ------
+        ValueError
+            If a value from the environment or the file is invalid.
+        """
+        layers = [(self.CLI, cli), (self.ENVIRONMENT, environment), (self.FILE, config_file)]
+        mode = next((layer[Mode.dest] for _, layer in layers if layer.get(Mode.dest)), None)
+        if mode is not None and mode not in self._fast_parser.modes:
+            raise ValueError(f"invalid mode: {mode!r}, possible modes: {', '.join(self._fast_parser.modes)}")
+        specs = self._fast_parser.specs(mode)
+        values = self._fast_parser.initial_values(mode)
+        sources = dict.fromkeys(values, self.DEFAULT)
+        for source, layer in reversed(layers):
+            for dest, value in layer.items():
+                if dest == Mode.dest:
+                    if value:
+                        values[dest] = mode
+                        sources[dest] = source
+                    continue
+                if dest not in specs:
+                    logging.debug('Value of "%s" argument from %s layer doesn\'t apply to mode %s.', dest, source, mode)
+                    continue
+                if source != self.CLI:
+                    try:
+                        value = self._convert(specs[dest], value)
+                    except Exception as exception:
+                        raise ValueError(f"invalid value of {dest} argument from {source} layer: {value!r} "
+                                         f"({exception})") from None
+                values[dest] = value
+                sources[dest] = source
+        return values, sources
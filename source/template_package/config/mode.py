@@ -2,7 +2,6 @@
 
 Represents possible script modes.
 """
-import argparse
 
 from template_package.config.arg import Arg
 
@@ -10,9 +9,12 @@ from template_package.config.arg import Arg
 class Mode(Arg, str):
     """The possible mode of the script.
     """
+    __slots__ = ()
+
     MODE_A = 'mode-a'
     MODE_B = 'mode-b'
     dest = 'mode'
+    env_name = 'TEMPLATE_PACKAGE_MODE'
 
     @staticmethod
     def add_subparsers(parser):
@@ -23,6 +25,7 @@ class Mode(Arg, str):
 
     @staticmethod
     def add_mode_a_parsers(parser, parents: list = None):
+        import argparse
         return parser.add_parser(Mode.MODE_A,
                                  description='Mode A.',
                                  formatter_class=argparse.RawTextHelpFormatter,
@@ -32,6 +35,7 @@ class Mode(Arg, str):
 
     @staticmethod
     def add_mode_b_parsers(parser, parents: list = None):
+        import argparse
         return parser.add_parser(Mode.MODE_B,
                                  description='Mode B.',
                                  formatter_class=argparse.RawTextHelpFormatter,
@@ -6,9 +6,12 @@ from template_package.config.arg import Arg
 
 class AModeOnlyParam(Arg, str):
 
+    __slots__ = ()
+
     _flag = '-a'
     _name = '--a-mode-only-param'
     dest = 'a_mode_only_param'
+    env_name = 'TEMPLATE_PACKAGE_A_MODE_ONLY_PARAM'
 
     @staticmethod
     def add_arg(arg_group):
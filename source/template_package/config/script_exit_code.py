@@ -11,4 +11,14 @@ class ScriptExitCode:
 
     OK = ExitCode(0, 'The script execution was successful.')
     INTERNAL_ERROR = ExitCode(1, f"Some internal {__name__} problem. Please contact with {__author__}.")
-    SOME_OTHER_ERROR = ExitCode(2, 'Some other script specific error.')
\ No newline at end of file
+    SOME_OTHER_ERROR = ExitCode(2, 'Some other script specific error.')
+    WORKER_ERROR = ExitCode(3, 'Processing of some work units failed.')
+
+    @classmethod
+    def from_code(cls, code: int) -> ExitCode:
+        """Returns the exit code of given numeric representation, SOME_OTHER_ERROR if there is no such one.
+        """
+        for exit_code in vars(cls).values():
+            if isinstance(exit_code, ExitCode) and exit_code.code == code:
+                return exit_code
+        return cls.SOME_OTHER_ERROR
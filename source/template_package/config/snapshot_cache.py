@@ -0,0 +1,239 @@
+"""SnapshotCache class implementation.
+
+Keeps resolved argument values of recurring runs, so a run with the same command line and environment
+gets its arguments without parsing and resolving them. A snapshot holds the values and their sources dumped
+with marshal. Its key is made of the command line, the environment variables of the arguments, the working
+directory and the package and Python versions, and it's valid as long as the files it was resolved from
+(the configuration file and @file argument files) have the same modification time and size.
+Values of list arguments kept in @file argument files are read into the snapshot if there are at most
+MAX_FILE_VALUES of them, values streamed with "@-" or "@path" are never stored.
+The least recently used snapshots are removed when there are more than MAX_ENTRIES of them.
+
+Usage: python -m template_package config compile [script arguments]
+       python -m template_package config clear-cache [--config-cache DIRECTORY]
+"""
+
+import contextlib
+import locale
+import marshal
+import os
+import sys
+import zlib
+
+from template_package.config.arg_file import FileValues
+from template_package.config.basic_args import ConfigCache
+from template_package.config.constants import __version__
+
+MAX_ENTRIES = 64
+
+# A number of values of a list argument kept in an argument file, above which the arguments aren't stored.
+MAX_FILE_VALUES = 10000
+
+_SUFFIX = '.snapshot'
+
+# Changed whenever the layout of snapshots changes, so older ones are never loaded.
+_LAYOUT = 1
+
+_USAGE = ('usage: python -m template_package config compile [script arguments]\n'
+          '       python -m template_package config clear-cache [--config-cache DIRECTORY]')
+
+
+def _file_state(path: str) -> tuple:
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def arg_files(argv: list) -> list:
+    """Returns paths of @file argument files given in a command line, including the ones given in the files.
+
+    Raises
+    ------
+    OSError
+        If a file can't be read.
+    """
+    paths = []
+    pending = [token[1:] for token in argv if token.startswith('@')]
+    while pending:
+        path = pending.pop()
+        if path in paths:
+            continue
+        paths.append(path)
+        with open(path, 'rb') as file:
+            pending.extend(line[1:].rstrip(b'\r\n').decode(locale.getpreferredencoding(False))
+                           for line in file if line.startswith(b'@'))
+    return paths
+
+
+def _dumpable(values: dict) -> dict:
+    """Returns the values with lists kept in argument files read into memory.
+
+    Raises
+    ------
+    ValueError
+        If a list kept in an argument file has more than MAX_FILE_VALUES values.
+    """
+    dumpable = {}
+    for dest, value in values.items():
+        if isinstance(value, FileValues):
+            if len(value) > MAX_FILE_VALUES:
+                raise ValueError(f"{dest} has more than {MAX_FILE_VALUES} values in {value.path}")
+            value = list(value)
+        dumpable[dest] = value
+    return dumpable
+
+
+class SnapshotCache:
+    """Represents a directory of snapshots of resolved arguments.
+
+    Keyword arguments
+    -----------------
+    directory: str
+        A path of the directory, created when the first snapshot is stored.
+    max_entries: int
+        A number of snapshots kept, the least recently used ones are removed above it.
+    """
+
+    def __init__(self, directory: str, max_entries: int = MAX_ENTRIES):
+        self.directory = directory
+        self._max_entries = max_entries
+
+    @staticmethod
+    def key(argv: list, environment_params: dict) -> tuple:
+        """Returns a key of the arguments resolved from given command line and environment values.
+        """
+        return _LAYOUT, __version__, sys.version, os.getcwd(), tuple(argv), tuple(sorted(environment_params.items()))
+
+    def path(self, key: tuple) -> str:
+        """Returns a path of the snapshot file for given key.
+        """
+        # The whole key is kept in the snapshot and compared when it's loaded, so a checksum is enough to name it.
+        return os.path.join(self.directory, f"{zlib.crc32(marshal.dumps(key)):08x}{_SUFFIX}")
+
+    def load(self, key: tuple):
+        """Reads a snapshot, marking it as recently used.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the snapshot, see key method.
+
+        Returns
+        -------
+        tuple
+            Resolved values and their sources, or None if there's no valid snapshot for the key.
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                stored_key, file_states, payload = marshal.load(file)
+            if stored_key != key or any(_file_state(state[0]) != state for state in file_states):
+                return None
+            values, sources = marshal.loads(payload)
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            # Missing, corrupted or written by another layout, resolved again then.
+            return None
+        return values, sources
+
+    def store(self, key: tuple, values: dict, sources: dict, argv: list, config_file: str = None) -> str:
+        """Writes a snapshot atomically and removes the least recently used ones above the limit.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the snapshot, see key method.
+        values: dict
+            Resolved values keyed by destination.
+        sources: dict
+            Names of layers the values come from, keyed by destination.
+        argv: list
+            The command line the values were resolved from, @file argument files given in it are checked
+            when the snapshot is loaded.
+        config_file: str
+            A path of the configuration file the values were resolved from, checked when the snapshot is loaded.
+
+        Returns
+        -------
+        str
+            A path of the snapshot file.
+
+        Raises
+        ------
+        ValueError
+            If the values can't be dumped, e.g. they are streamed from a file or the standard input
+            or there are more than MAX_FILE_VALUES of them in an argument file.
+        OSError
+            If the snapshot can't be written.
+        """
+        payload = marshal.dumps((_dumpable(values), sources))
+        files = arg_files(argv) + ([config_file] if config_file else [])
+        data = marshal.dumps((key, [_file_state(path) for path in files], payload))
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+        self._evict()
+        return path
+
+    def _evict(self):
+        """Removes the least recently used snapshots above the limit.
+        """
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(_SUFFIX)]
+        if len(entries) <= self._max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in entries[:len(entries) - self._max_entries]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry.path)
+
+    def clear(self) -> int:
+        """Removes all snapshots, returns their number.
+        """
+        removed = 0
+        with contextlib.suppress(FileNotFoundError):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(_SUFFIX):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(entry.path)
+                        removed += 1
+        return removed
+
+
+def run_command(argv: list) -> int:
+    """Runs a config command. "compile" resolves given script arguments and stores their snapshot,
+    "clear-cache" removes all snapshots. The snapshot directory is taken from --config-cache
+    or TEMPLATE_PACKAGE_CONFIG_CACHE.
+
+    Parameters
+    ----------
+    argv: list
+        The command and its arguments, without the program name and "config".
+
+    Returns
+    -------
+    int
+        The command exit code.
+    """
+    command, argv = (argv[0], argv[1:]) if argv else (None, [])
+    if command not in ('compile', 'clear-cache'):
+        print(_USAGE, file=sys.stderr)
+        return 2
+    directory = ConfigCache.peek(argv)
+    if not directory:
+        print(f"Snapshot directory isn't set, it's given with {ConfigCache._name} or {ConfigCache.env_name}.",
+              file=sys.stderr)
+        return 2
+    if command == 'clear-cache':
+        print(f"Removed {SnapshotCache(directory).clear()} snapshot(s) from {directory}.")
+        return 0
+    from template_package.config.config import Config
+    config = Config(argv)
+    config.close()
+    if config.snapshot_path is None:
+        print(f"The arguments could not be stored, see the log for details. Values streamed with @- or @path "
+              f"and more than {MAX_FILE_VALUES} values of a list in an argument file aren't stored.", file=sys.stderr)
+        return 1
+    print(f"Snapshot stored in {config.snapshot_path}.")
+    return 0
@@ -2,8 +2,40 @@
 """
 
 from argparse import ArgumentTypeError
+from array import array
 from typing import Iterable
 
+# Type codes of array.array used to store elements of given type.
+_ARRAY_TYPE_CODES = {'int': 'q', 'float': 'd'}
+# Functions converting a single element to given type, bytes are given as integers 0-255.
+ELEMENT_TYPES = {'int': int, 'float': float, 'bytes': int}
+
+
+def compact_array(elements: Iterable, element_type: str):
+    """Converts elements to given type and keeps them in a compact array.
+
+    Parameters
+    ----------
+    elements: Iterable
+        Elements to be converted, e.g. strings.
+    element_type: str
+        A type elements are converted to: int, float or bytes (integers 0-255).
+
+    Returns
+    -------
+    array.array or memoryview
+        array.array for int and float, a read-only memoryview for bytes.
+
+    Raises
+    ------
+    ValueError
+        If an element can't be converted.
+    """
+    convert = ELEMENT_TYPES[element_type]
+    if element_type == 'bytes':
+        return memoryview(bytes(map(convert, elements)))
+    return array(_ARRAY_TYPE_CODES[element_type], map(convert, elements))
+
 
 class TupleType:
     """Factory for creating tuple type.
@@ -28,6 +60,12 @@ class TupleType:
     nested: bool
         True if splitting throw a sting should be nested, false otherwise.
         Separation signs are used in the order of sequence given with sep parameter.
+    element_type: str
+        A type elements are converted to: int, float or bytes (integers 0-255). Elements are then kept
+        in a compact array instead of a tuple of strings: array.array for int and float, a read-only memoryview
+        for bytes; in nested mode the innermost lists are converted. None keeps strings.
+    backend: str
+        Storage of converted elements: array (standard library) or numpy (numpy.ndarray, numpy has to be installed).
     """
 
     def __init__(self,
@@ -35,12 +73,34 @@ class TupleType:
                  min_size: int = None,
                  max_size: int = None,
                  valid_values: Iterable = None,
-                 nested: bool = False):
+                 nested: bool = False,
+                 element_type: str = None,
+                 backend: str = 'array'):
+        if element_type not in (None, 'int', 'float', 'bytes'):
+            raise ValueError(f"invalid element type: {element_type!r}")
+        if backend not in ('array', 'numpy'):
+            raise ValueError(f"invalid backend: {backend!r}")
         self._sep = list(sep)
         self._min_size = min_size
         self._max_size = max_size
         self._valid_values = valid_values
         self._nested = nested
+        self._element_type = element_type
+        self._numpy = None
+        if element_type is not None and backend == 'numpy':
+            try:
+                import numpy
+            except ImportError:
+                raise ValueError('numpy backend requires numpy to be installed') from None
+            self._numpy = numpy
+        # Hashable valid values are put in a set once, so each element is checked with a set lookup.
+        # A string keeps its substring matching.
+        self._valid_set = None
+        if valid_values and not nested and not isinstance(valid_values, str):
+            try:
+                self._valid_set = frozenset(valid_values)
+            except TypeError:
+                pass
 
     def __call__(self, string):
         if string == '':
@@ -56,7 +116,10 @@ class TupleType:
                     break
             else:
                 list_v = [string]
-        tuple_v = tuple(list_v)
+        if self._element_type is not None and not self._nested:
+            tuple_v = self._convert(list_v)
+        else:
+            tuple_v = tuple(list_v)
         tuple_l = len(tuple_v)
         if self._min_size:
             if tuple_l < self._min_size:
@@ -64,17 +127,50 @@ class TupleType:
         if self._max_size:
             if tuple_l > self._max_size:
                 raise ArgumentTypeError(f'parameter takes {self._max_size} values at most but {tuple_l} were given')
-        if self._valid_values:
+        if self._valid_set is not None:
+            values = tuple_v.tolist() if self._numpy is not None else tuple_v
+            if not self._valid_set.issuperset(values):
+                val = next(val for val in values if val not in self._valid_set)
+                raise ArgumentTypeError(f'"{val}" not found in the set of possible values: {self._valid_values}')
+        elif self._valid_values:
             for val in tuple_v:
                 if val not in self._valid_values:
                     raise ArgumentTypeError(f'"{val}" not found in the set of possible values: {self._valid_values}')
         return tuple_v
 
+    def _convert(self, elements: list):
+        """Converts string elements to a compact array of the element type.
+
+        Parameters
+        ----------
+        elements: list
+            Elements to be converted.
+
+        Returns
+        -------
+        array.array, memoryview or numpy.ndarray
+            The converted elements.
+        """
+        try:
+            if self._numpy is not None:
+                numpy = self._numpy
+                values = numpy.array(elements).astype(numpy.float64 if self._element_type == 'float' else numpy.int64)
+                if self._element_type == 'bytes':
+                    if len(values) and (values.min() < 0 or values.max() > 255):
+                        raise ValueError('bytes must be in range(0, 256)')
+                    values = values.astype(numpy.uint8)
+                return values
+            return compact_array(elements, self._element_type)
+        except (ValueError, OverflowError) as exception:
+            raise ArgumentTypeError(f'elements should be of {self._element_type} type: {exception}') from None
+
     def __repr__(self):
         kwargs = [('sep', self._sep),
                   ('min_size', self._min_size),
                   ('max_size', self._max_size),
                   ('valid_values', self._valid_values)]
+        if self._element_type is not None:
+            kwargs.append(('element_type', self._element_type))
         args_list = []
         for keyword, arg in kwargs:
             if isinstance(arg, str):
@@ -99,6 +195,8 @@ class TupleType:
             Nested list.
         """
         temp_list = []
+        if len(sep) == 1 and self._element_type is not None:
+            return self._convert(string.split(sep[0]))
         if sep:
             for element in string.split(sep[0]):
                 temp_list.append(self._nested_split(element, sep[1:]))
@@ -0,0 +1,158 @@
+"""Ordered mapping of work units onto a pool of workers.
+"""
+
+import logging
+import logging.handlers
+import os
+from collections import deque
+
+
+class _RecordForwarder(logging.Handler):
+    """Passes records received from worker processes to the loggers of the main process.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_worker_process(log_queue, level: int):
+    """Makes a worker process send its log records to the main process.
+    """
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def _collect(unit, future):
+    """Waits for the result of a unit.
+    """
+    try:
+        return unit, future.result(), None
+    except Exception as exception:
+        return unit, None, exception
+
+
+def cpu_count() -> int:
+    """Returns a number of CPUs the process can run on.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def map_ordered(function, units, workers: int = 1, executor: str = 'process', window: int = None):
+    """Applies the function to work units using a pool of workers.
+
+    Units are taken from the iterable lazily, at most window of them are processed or waiting
+    at the same time, so any number of units can be processed in constant memory.
+    Log records of worker processes are passed to the handlers of the main process.
+
+    Parameters
+    ----------
+    function: Callable
+        A function taking a single unit. It has to be picklable for the process pool.
+    units: Iterable
+        Work units.
+    workers: int
+        A number of workers. Units are processed in the calling thread if it is 1, 0 means one worker per CPU.
+    executor: str
+        A kind of the pool: "process" or "thread".
+    window: int
+        A maximum number of units submitted and not collected yet, twice the number of workers by default.
+
+    Returns
+    -------
+    Iterator
+        Tuples of a unit, the function result and the exception raised by the function (or None),
+        in the order of the units.
+    """
+    workers = workers or cpu_count()
+    if workers == 1:
+        for unit in units:
+            try:
+                yield unit, function(unit), None
+            except Exception as exception:
+                yield unit, None, exception
+        return
+    import concurrent.futures
+    listener = None
+    if executor == 'process':
+        import multiprocessing
+        log_queue = multiprocessing.Queue()
+        listener = logging.handlers.QueueListener(log_queue, _RecordForwarder())
+        listener.start()
+        pool = concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker_process,
+                                                      initargs=(log_queue, logging.getLogger().getEffectiveLevel()))
+    elif executor == 'thread':
+        pool = concurrent.futures.ThreadPoolExecutor(workers)
+    else:
+        raise ValueError(f"unknown executor: {executor!r}")
+    window = window or 2 * workers
+    pending = deque()
+    try:
+        with pool:
+            try:
+                for unit in units:
+                    pending.append((unit, pool.submit(function, unit)))
+                    if len(pending) >= window:
+                        yield _collect(*pending.popleft())
+                while pending:
+                    yield _collect(*pending.popleft())
+            finally:
+                for _, future in pending:
+                    future.cancel()
+    finally:
+        if listener is not None:
+            listener.stop()
+
+
+async def map_ordered_async(function, units, workers: int = 1, window: int = None):
+    """Applies the coroutine function to work units concurrently, as asyncio tasks.
+
+    Units are taken from the iterable lazily, at most window of them are processed or waiting
+    at the same time and at most workers of them are processed concurrently.
+
+    Parameters
+    ----------
+    function: Callable
+        A coroutine function taking a single unit.
+    units: Iterable
+        Work units.
+    workers: int
+        A maximum number of units processed concurrently, 0 means one per CPU.
+    window: int
+        A maximum number of units started and not collected yet, twice the number of workers by default.
+
+    Returns
+    -------
+    AsyncIterator
+        Tuples of a unit, the function result and the exception raised by the function (or None),
+        in the order of the units.
+    """
+    import asyncio
+    workers = workers or cpu_count()
+    window = window or 2 * workers
+    semaphore = asyncio.Semaphore(workers)
+
+    async def process(unit):
+        async with semaphore:
+            return await function(unit)
+
+    async def collect(unit, task):
+        try:
+            return unit, await task, None
+        except Exception as exception:
+            return unit, None, exception
+
+    pending = deque()
+    try:
+        for unit in units:
+            pending.append((unit, asyncio.ensure_future(process(unit))))
+            if len(pending) >= window:
+                yield await collect(*pending.popleft())
+        while pending:
+            yield await collect(*pending.popleft())
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,73 @@
+"""LazyJson, LazyRepr and LazyJoin classes implementation.
+
+Log message arguments serialised only when a handler formats the record, e.g.
+logging.debug('Arguments:\n%s.', LazyJson(arguments, indent=4)) costs nothing if no handler emits DEBUG records.
+The value is serialised as it is at that time, which for queued or recorded records may be later than the call,
+so a copy should be passed if the value changes afterwards.
+"""
+
+from template_package.lib.utilities import iterable_to_string
+
+
+class LazyJson:
+    """A value serialised to JSON when it's formatted.
+
+    Keyword arguments
+    -----------------
+    value: object
+        A value to be serialised.
+    kwargs: dict
+        Keyword arguments of json.dumps, e.g. indent.
+    """
+
+    __slots__ = ('_value', '_kwargs')
+
+    def __init__(self, value, **kwargs):
+        self._value = value
+        self._kwargs = kwargs
+
+    def __str__(self):
+        import json
+        return json.dumps(self._value, **self._kwargs)
+
+
+class LazyRepr:
+    """A value formatted with repr when it's formatted.
+
+    Keyword arguments
+    -----------------
+    value: object
+        A value to be represented.
+    """
+
+    __slots__ = ('_value',)
+
+    def __init__(self, value):
+        self._value = value
+
+    def __str__(self):
+        return repr(self._value)
+
+
+class LazyJoin:
+    """An iterable joined into a string with iterable_to_string when it's formatted.
+
+    Keyword arguments
+    -----------------
+    con: Iterable
+        An Iterable to be joined.
+    sep: str
+        A sign to separate elements in the string.
+    wrap: str
+        A string which will be used as a wrapper for each element.
+    """
+
+    __slots__ = ('_con', '_sep', '_wrap')
+
+    def __init__(self, con, sep: str = ",", wrap: str = None):
+        self._con = con
+        self._sep = sep
+        self._wrap = wrap
+
+    def __str__(self):
+        return iterable_to_string(con=self._con, sep=self._sep, wrap=self._wrap)
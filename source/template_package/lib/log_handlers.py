@@ -0,0 +1,295 @@
+"""BufferedFileHandler, RotatingFileHandler and FlightRecorderHandler classes implementation.
+
+Log file handlers writing formatted records in batches, one of them also rotating the file by size and by time,
+with rotated segments compressed and old ones removed by a background thread, and a handler keeping
+the latest records in memory until they are needed.
+"""
+
+import collections
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+
+# Rotation periods in seconds, "midnight" rotates at the local midnight.
+WHEN_INTERVALS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400, 'midnight': 86400}
+FSYNC_POLICIES = ('never', 'interval', 'always')
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """A file handler keeping formatted records in memory and writing them in a single call.
+
+    The buffer is written when it reaches a size or a number of records, when a record of ERROR severity
+    or higher is logged, periodically from a background thread and when the handler is flushed or closed.
+
+    Keyword arguments
+    -----------------
+    filename: os.PathLike
+        A path of the log file.
+    mode: str
+        A mode the file is opened with: w (overwrite) or a (append).
+    encoding: str
+        An encoding of the file.
+    buffer_bytes: int
+        A size of the buffer the records are written at, 0 writes every record at once.
+    buffer_records: int
+        A number of buffered records the records are written at, 0 disables this limit.
+    flush_interval: float
+        A number of seconds between periodic writes of the buffer, 0 disables them. They are done only
+        if the records are buffered or the file is synchronised to the disk on them.
+    fsync: str
+        When the file is synchronised to the disk: never, interval (on periodic writes) or always (on every write).
+    """
+
+    def __init__(self, filename: os.PathLike, mode: str = 'a', encoding: str = None, buffer_bytes: int = 0,
+                 buffer_records: int = 0, flush_interval: float = 0, fsync: str = 'never'):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"invalid fsync policy: {fsync!r}")
+        super().__init__(filename, mode, encoding=encoding)
+        self.buffer_bytes = buffer_bytes
+        self.buffer_records = buffer_records
+        self.fsync = fsync
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._stopped = threading.Event()
+        self._flusher = None
+        # Without buffering, records are written at once and periodic writes only synchronise the file.
+        if flush_interval > 0 and (buffer_bytes or fsync == 'interval'):
+            self._flusher = threading.Thread(target=self._flush_periodically, args=(flush_interval,),
+                                             name='LogFlusher', daemon=True)
+            self._flusher.start()
+
+    def emit(self, record: logging.LogRecord):
+        """Buffers the formatted record, writing the buffer if any of its limits is reached.
+        """
+        try:
+            self._buffer_message(self.format(record) + self.terminator, record.levelno)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _buffer_message(self, message: str, levelno: int):
+        self._buffer.append(message)
+        self._buffered_bytes += len(message)
+        if (levelno >= logging.ERROR or self._buffered_bytes >= self.buffer_bytes
+                or (self.buffer_records and len(self._buffer) >= self.buffer_records)):
+            self.flush()
+
+    def flush(self, fsync: bool = False):
+        """Writes the buffered records and flushes the file.
+
+        Parameters
+        ----------
+        fsync: bool
+            True if the file should be synchronised to the disk regardless of the fsync policy.
+        """
+        self.acquire()
+        try:
+            if self._buffer:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(''.join(self._buffer))
+                self._buffer.clear()
+                self._buffered_bytes = 0
+            if self.stream is not None:
+                self.stream.flush()
+                if fsync or self.fsync == 'always':
+                    os.fsync(self.stream.fileno())
+        finally:
+            self.release()
+
+    def _flush_periodically(self, interval: float):
+        while not self._stopped.wait(interval):
+            try:
+                self.flush(fsync=self.fsync == 'interval')
+            except (OSError, ValueError):
+                # The file was closed meanwhile.
+                pass
+
+    def close(self):
+        """Stops periodic writes, writes the buffered records and closes the file.
+        """
+        # The flusher isn't joined, it may be waiting for the lock held by logging.shutdown calling this method.
+        self._stopped.set()
+        super().close()
+
+
+class RotatingFileHandler(BufferedFileHandler):
+    """A file handler rotating the file when it gets too big or too old.
+
+    A rotated segment is renamed to "<file name>.<time of rotation>", which is the only work done
+    by the logging caller. Compressing the segment and removing the oldest ones happen on a background thread.
+
+    Keyword arguments
+    -----------------
+    filename: os.PathLike
+        A path of the log file.
+    mode: str
+        A mode the file is opened with at first: w (overwrite) or a (append).
+    max_bytes: int
+        A size the file is rotated at, 0 disables rotation by size.
+    when: str
+        A period the file is rotated after: S, M, H, D or midnight. None disables rotation by time.
+    backup_count: int
+        A number of rotated segments kept, 0 means keeping all of them.
+    compress: bool
+        True if rotated segments should be compressed with gzip.
+    encoding: str
+        An encoding of the file.
+    buffering: dict
+        Keyword arguments of BufferedFileHandler setting up buffering of records.
+    """
+
+    def __init__(self, filename: os.PathLike, mode: str = 'a', max_bytes: int = 0, when: str = None,
+                 backup_count: int = 0, compress: bool = True, encoding: str = None, **buffering):
+        if when is not None and when not in WHEN_INTERVALS:
+            raise ValueError(f"invalid rotation period: {when!r}")
+        super().__init__(filename, mode, encoding=encoding, **buffering)
+        self.max_bytes = max_bytes
+        self.when = when
+        self.backup_count = backup_count
+        self.compress = compress
+        self._size = self.stream.tell() if self.stream is not None else 0
+        # Counted from the last write to the file, so a file appended to by short runs is rotated as well.
+        self._rollover_at = self._next_rollover(os.stat(self.baseFilename).st_mtime
+                                                if os.path.exists(self.baseFilename) else time.time())
+        self._worker = None
+
+    def _next_rollover(self, now: float):
+        """Returns the time of the next rotation by time counted from given time, None if it's disabled.
+        """
+        if self.when is None:
+            return None
+        if self.when == 'midnight':
+            local = time.localtime(now)
+            return time.mktime((local.tm_year, local.tm_mon, local.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        return now + WHEN_INTERVALS[self.when]
+
+    def emit(self, record: logging.LogRecord):
+        """Buffers the record, rotating the file before if it's due. The record is formatted only once.
+        """
+        try:
+            message = self.format(record) + self.terminator
+            if ((self.max_bytes and self._size and self._size + len(message) > self.max_bytes)
+                    or (self._rollover_at is not None and record.created >= self._rollover_at)):
+                self.doRollover()
+            self._size += len(message)
+            self._buffer_message(message, record.levelno)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        """Renames the file to a rotated segment, opens a new one and hands the segment over to the background thread.
+        """
+        self.flush()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        now = time.time()
+        base = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}"
+        segment, suffix = base, 0
+        while os.path.exists(segment) or os.path.exists(segment + '.gz'):
+            suffix += 1
+            segment = f"{base}.{suffix}"
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, segment)
+            if self._worker is None:
+                import concurrent.futures
+                self._worker = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='LogRotation')
+            self._worker.submit(self._process_segment, segment)
+        self.mode = 'a'
+        self.stream = self._open()
+        self._size = 0
+        self._rollover_at = self._next_rollover(now)
+
+    def _process_segment(self, segment: str):
+        """Compresses a rotated segment and removes the oldest ones, run on the background thread.
+        """
+        try:
+            if self.compress:
+                with open(segment, 'rb') as source, gzip.open(segment + '.gz.tmp', 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                os.replace(segment + '.gz.tmp', segment + '.gz')
+                os.remove(segment)
+            if self.backup_count:
+                for old_segment in self.segments()[:-self.backup_count]:
+                    os.remove(old_segment)
+        except OSError as exception:
+            logging.getLogger(__name__).error('Rotated log segment %s could not be processed: %s.', segment, exception)
+
+    def segments(self) -> list:
+        """Returns paths of rotated segments, from the oldest.
+        """
+        directory, name = os.path.split(self.baseFilename)
+        prefix = name + '.'
+
+        def order(entry):
+            # By the time of rotation, then by the suffix added to segments rotated in the same second.
+            stamp, _, suffix = entry[len(prefix):].removesuffix('.gz').partition('.')
+            return stamp, int(suffix) if suffix.isdigit() else 0
+
+        segments = [entry for entry in os.listdir(directory or '.')
+                    if entry.startswith(prefix) and not entry.endswith('.tmp') and entry[len(prefix):][:1].isdigit()]
+        return [os.path.join(directory, entry) for entry in sorted(segments, key=order)]
+
+    def close(self):
+        """Closes the file and waits for the background processing of rotated segments.
+        """
+        super().close()
+        if self._worker is not None:
+            self._worker.shutdown(wait=True)
+            self._worker = None
+
+
+class FlightRecorderHandler(logging.Handler):
+    """A handler keeping the latest records, unformatted, in a ring buffer and passing them to a target handler
+    only when a record of ERROR severity or higher is logged or a dump is requested.
+
+    Records are kept as they are, so a record whose arguments are changed afterwards shows their latest values.
+
+    Keyword arguments
+    -----------------
+    capacity: int
+        A maximum number of kept records, the oldest ones are dropped first.
+    target: logging.Handler
+        A handler the records are passed to, e.g. a file handler.
+    """
+
+    def __init__(self, capacity: int, target: logging.Handler):
+        super().__init__(logging.DEBUG)
+        self.target = target
+        self._records = collections.deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        """Keeps the record, dumping all kept records if its severity is ERROR or higher.
+        """
+        self._records.append(record)
+        if record.levelno >= logging.ERROR:
+            self.dump()
+
+    def dump(self):
+        """Passes the kept records to the target handler and forgets them.
+        """
+        self.acquire()
+        try:
+            records = list(self._records)
+            self._records.clear()
+            for record in records:
+                self.target.handle(record)
+            self.target.flush()
+        finally:
+            self.release()
+
+    def setFormatter(self, fmt: logging.Formatter):
+        self.target.setFormatter(fmt)
+
+    def close(self):
+        """Closes the target handler, the kept records are dropped.
+        """
+        self.target.close()
+        super().close()
@@ -0,0 +1,65 @@
+"""BoundedQueueHandler and BlockingQueueListener classes implementation.
+
+The module is imported only when asynchronous logging is enabled.
+"""
+
+import logging
+import logging.handlers
+import queue
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """A queue handler which applies given policy when the queue is full.
+
+    Keyword arguments
+    -----------------
+    log_queue: queue.Queue
+        A bounded queue the records are put into.
+    policy: str
+        What to do with a record when the queue is full:
+        block - wait until the listener makes room (backpressure),
+        drop-new - discard the record being logged,
+        drop-old - discard the oldest queued record.
+    """
+
+    POLICIES = ('block', 'drop-new', 'drop-old')
+
+    def __init__(self, log_queue: queue.Queue, policy: str = 'block'):
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown queue policy: {policy}")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Returns the record as it is. The listener runs in the same process, so merging message arguments
+        and formatting are left to the handlers it serves, in its thread. Records kept unformatted,
+        e.g. by the flight recorder, and lazy arguments aren't formatted in the logging thread then.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.policy == 'block':
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                if self.policy == 'drop-new':
+                    self.dropped += 1
+                    return
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+
+
+class BlockingQueueListener(logging.handlers.QueueListener):
+    """A queue listener which waits for a room in the queue to put the stop sentinel.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
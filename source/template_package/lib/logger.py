@@ -1,31 +1,34 @@
-"""Logger and HiddenPasswordFormatterProxy classes implementation.
+"""Logger, HiddenSensitiveDataFormatter and JsonFormatter classes implementation.
 """
 
+import atexit
 import logging
-import re
+import os
 import sys
+import time
+from json.encoder import encode_basestring
 from logging import Formatter
-from pathlib import Path
-from typing import Iterable
 
 from template_package.config.constants import DATE_FORMAT, DEBUG_FORMAT, BASIC_FORMAT
+from template_package.lib.redaction import SensitiveDataRegistry, sensitive_data
 
 
-class _HiddenSensitiveDataFormatterProxy(Formatter):
-    """A handler formatter which hides sensitive data.
+class _HiddenSensitiveDataFormatter(Formatter):
+    """A handler formatter which hides sensitive data registered in the sensitive data registry.
 
     Keyword arguments
     -----------------
-    formatter: logging.Formatter
-        A formatter used by logger.
-    sensitive_patterns: Iterable
-        A collection of sensitive phrases. Regex can be used here.
+    fmt: str
+        A format string for the message as a whole.
+    datefmt: str
+        A format string for the date/time portion of the message.
+    registry: SensitiveDataRegistry
+        A registry of sensitive data to be hidden.
     """
 
-    def __init__(self, formatter: logging.Formatter, sensitive_patterns: Iterable):
-        super().__init__()
-        self._formatter = formatter
-        self.__password_patterns = [re.compile(pattern) for pattern in sensitive_patterns]
+    def __init__(self, fmt: str = None, datefmt: str = None, registry: SensitiveDataRegistry = sensitive_data):
+        super().__init__(fmt, datefmt)
+        self._registry = registry
 
     def format(self, record: logging.LogRecord) -> str:
         """Format the specified record as text.
@@ -41,10 +44,148 @@ class _HiddenSensitiveDataFormatterProxy(Formatter):
         str
           Formatted record with sensitive data being hidden.
         """
-        log_msg = self._formatter.format(record)
-        for pattern in self.__password_patterns:
-            log_msg = pattern.sub("*" * 5, log_msg)
-        return log_msg
+        return self._registry.redact(super().format(record))
+
+
+class _JsonFormatter(Formatter):
+    """A handler formatter writing a record as a JSON line, hiding sensitive data registered
+    in the sensitive data registry before the values are encoded.
+
+    Fields of the line are laid out once, so formatting a record only encodes its values.
+    Attributes added to the record with "extra" argument of a logging call are included after the standard fields.
+
+    Keyword arguments
+    -----------------
+    fields: tuple
+        Pairs of a field name and a name of the record attribute put in it, written after time and level.
+    registry: SensitiveDataRegistry
+        A registry of sensitive data to be hidden.
+    """
+
+    # Attributes every record has, anything else was passed as "extra".
+    _RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+    _STANDARD_SIZE = len(vars(logging.LogRecord('', 0, '', 0, '', (), None)))
+
+    def __init__(self, fields: tuple = (), registry: SensitiveDataRegistry = sensitive_data):
+        super().__init__()
+        self._registry = registry
+        self._layout = tuple((f", {encode_basestring(name)}: ", attribute) for name, attribute in fields)
+        self._second = None
+        self._second_text = None
+        self._zone = time.strftime('%z')
+
+    def _time(self, record: logging.LogRecord) -> str:
+        """Returns the record time in ISO 8601 format, the part up to seconds is formatted once per second.
+        """
+        second = int(record.created)
+        if second != self._second:
+            self._second_text = time.strftime('%Y-%m-%dT%H:%M:%S', self.converter(second))
+            self._second = second
+        return f"{self._second_text}.{int(record.msecs):03d}{self._zone}"
+
+    def _value(self, value) -> str:
+        if isinstance(value, str):
+            return encode_basestring(self._registry.redact(value))
+        if value is None or isinstance(value, (bool, int, float)):
+            import json
+            return json.dumps(value)
+        return encode_basestring(self._registry.redact(str(value)))
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format the specified record as a JSON object in a single line.
+
+        Parameters
+        ----------
+        record: logging.LogRecord
+            A LogRecord instance representing an event being logged.
+
+        Returns
+        -------
+        str
+          Formatted record with sensitive data being hidden.
+        """
+        parts = ['{"time": "', self._time(record), '", "level": "', record.levelname, '"']
+        for prefix, attribute in self._layout:
+            value = getattr(record, attribute)
+            parts.append(prefix)
+            parts.append(encode_basestring(value) if isinstance(value, str) else str(value))
+        parts.append(', "message": ')
+        parts.append(encode_basestring(self._registry.redact(record.getMessage())))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts.append(', "exception": ')
+            parts.append(encode_basestring(self._registry.redact(record.exc_text)))
+        if record.stack_info:
+            parts.append(', "stack": ')
+            parts.append(encode_basestring(self._registry.redact(record.stack_info)))
+        if len(record.__dict__) > self._STANDARD_SIZE:
+            for name in sorted(record.__dict__.keys() - self._RECORD_ATTRIBUTES):
+                parts.append(f", {encode_basestring(name)}: ")
+                parts.append(self._value(record.__dict__[name]))
+        parts.append('}')
+        return ''.join(parts)
+
+
+# Fields of DEBUG_FORMAT written by the JSON formatter in addition to time, level and message.
+_DEBUG_JSON_FIELDS = (('module', 'module'), ('function', 'funcName'), ('line', 'lineno'))
+
+
+class _RecordCountingHandler(logging.Handler):
+    """A handler counting records by level.
+
+    Keyword arguments
+    -----------------
+    counter: Metric
+        A counter with level label.
+    """
+
+    def __init__(self, counter):
+        super().__init__()
+        self._counter = counter
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The handler lock isn't taken, the counter keeps a separate cell per thread.
+        self._counter.labels(record.levelname).inc()
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+
+class _BufferingHandler(logging.Handler):
+    """A handler keeping records until the log file handlers are set up.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+class _CountingStream:
+    """Wraps a stream of a handler and counts bytes written to it.
+
+    Keyword arguments
+    -----------------
+    stream: TextIO
+        The wrapped stream.
+    counter: Metric
+        A counter of written bytes.
+    """
+
+    def __init__(self, stream, counter):
+        self._stream = stream
+        self._counter = counter
+
+    def write(self, string: str):
+        self._counter.inc(len(string) if string.isascii() else len(string.encode(self._stream.encoding)))
+        return self._stream.write(string)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
 
 
 class Logger:
@@ -59,6 +200,18 @@ class Logger:
         self._stdout_handler = None
         self._file_handler = None
         self._debug_file_handler = None
+        self._queue_handler = None
+        self._queue_listener = None
+        self._metrics_handler = None
+        self._buffering_handler = None
+        self._rotation = {}
+        self._flush_policy = {}
+        self._format = 'text'
+
+    def _handlers(self) -> list:
+        """Returns configured sink handlers.
+        """
+        return [h for h in [self._stdout_handler, self._file_handler, self._debug_file_handler] if h is not None]
 
     def set_level(self, level: str):
         """Sets up logging level
@@ -72,7 +225,9 @@ class Logger:
         self._level = logging.getLevelName(level)
         for handler in [h for h in [self._stdout_handler, self._file_handler] if h is not None]:
             handler.setLevel(self._level)
-            handler.setFormatter(logging.Formatter(self._logger_format(), DATE_FORMAT))
+            handler.setFormatter(self._formatter(self._logger_format()))
+        if self._queue_handler:
+            self._queue_handler.setLevel(min(h.level for h in self._handlers()))
 
     def _logger_format(self):
         """Chooses logger format base of logging severity level.
@@ -88,43 +243,262 @@ class Logger:
             logger_format = BASIC_FORMAT
         return logger_format
 
+    def set_format(self, log_format: str):
+        """Sets up format of records written by all sinks.
+
+        Parameters
+        ----------
+        log_format: str
+            text (lines in BASIC_FORMAT or DEBUG_FORMAT) or json (JSON lines with the same fields).
+        """
+        self._format = log_format
+        for handler in [h for h in [self._stdout_handler, self._file_handler] if h is not None]:
+            handler.setFormatter(self._formatter(self._logger_format()))
+        if self._debug_file_handler:
+            self._debug_file_handler.setFormatter(self._formatter(DEBUG_FORMAT))
+
+    def _formatter(self, logger_format: str) -> Formatter:
+        """Creates a formatter of the set up format with fields of given text format.
+        """
+        if self._format == 'json':
+            fields = _DEBUG_JSON_FIELDS if logger_format == DEBUG_FORMAT else ()
+            return _JsonFormatter(fields)
+        return _HiddenSensitiveDataFormatter(logger_format, DATE_FORMAT)
+
     def config_stdout_handler(self):
         """Sets up console stream handler.
         """
         if not self._stdout_handler:
             self._stdout_handler = logging.StreamHandler(sys.stdout)
-        self._stdout_handler.setFormatter(logging.Formatter(self._logger_format(), DATE_FORMAT))
+        self._stdout_handler.setFormatter(self._formatter(self._logger_format()))
         self._stdout_handler.setLevel(self._level)
         self._log.addHandler(self._stdout_handler)
 
-    def config_log_file_handler(self, path: Path):
+    def config_rotation(self, max_bytes: int = 0, when: str = None, backup_count: int = 0, compress: bool = True):
+        """Sets up rotation of log files configured afterwards.
+
+        Parameters
+        ----------
+        max_bytes: int
+            A size a file is rotated at, 0 disables rotation by size.
+        when: str
+            A period a file is rotated after: S, M, H, D or midnight. None disables rotation by time.
+        backup_count: int
+            A number of rotated segments kept, 0 means keeping all of them.
+        compress: bool
+            True if rotated segments should be compressed with gzip in the background.
+        """
+        self._rotation = {'max_bytes': max_bytes, 'when': when, 'backup_count': backup_count, 'compress': compress}
+
+    def config_flush_policy(self, buffer_bytes: int = 0, buffer_records: int = 0, flush_interval: float = 0,
+                            fsync: str = 'never'):
+        """Sets up buffering of log files configured afterwards.
+
+        Parameters
+        ----------
+        buffer_bytes: int
+            A size of buffered records they are written at, 0 writes every record at once.
+        buffer_records: int
+            A number of buffered records they are written at, 0 disables this limit.
+        flush_interval: float
+            A number of seconds between periodic writes of buffered records, 0 disables them.
+        fsync: str
+            When log files are synchronised to the disk: never, interval or always.
+        """
+        self._flush_policy = {'buffer_bytes': buffer_bytes, 'buffer_records': buffer_records,
+                              'flush_interval': flush_interval, 'fsync': fsync}
+
+    def _file_handler_for(self, path: os.PathLike, mode: str) -> logging.FileHandler:
+        """Creates a handler writing to given file, rotating and buffering it if set up.
+        """
+        if self._rotation.get('max_bytes') or self._rotation.get('when'):
+            from template_package.lib.log_handlers import RotatingFileHandler
+            return RotatingFileHandler(path, mode, **self._rotation, **self._flush_policy)
+        if self._flush_policy.get('buffer_bytes') or self._flush_policy.get('fsync', 'never') != 'never':
+            from template_package.lib.log_handlers import BufferedFileHandler
+            return BufferedFileHandler(path, mode, **self._flush_policy)
+        return logging.FileHandler(path, mode=mode)
+
+    def config_log_file_handler(self, path: os.PathLike, mode: str = 'a'):
         """Sets up file handler for standard severity.
 
         Parameters
         ----------
-        path: Path
+        path: os.PathLike
             A path to log-file.
+        mode: str
+            A mode the file is opened with: w (overwrite) or a (append).
         """
         if not self._file_handler:
-            self._file_handler = logging.FileHandler(path, mode='a')
-        self._file_handler.setFormatter(logging.Formatter(self._logger_format(), DATE_FORMAT))
+            self._file_handler = self._file_handler_for(path, mode)
+        self._file_handler.setFormatter(self._formatter(self._logger_format()))
         self._file_handler.setLevel(self._level)
         self._log.addHandler(self._file_handler)
 
-    def config_debug_log_file_handler(self, path: Path):
+    def config_debug_log_file_handler(self, path: os.PathLike, mode: str = 'a', recorder_capacity: int = 0):
         """Sets up file handler for debug severity.
 
         Parameters
         ----------
-        path: Path
+        path: os.PathLike
             A path to log-file.
+        mode: str
+            A mode the file is opened with: w (overwrite) or a (append).
+        recorder_capacity: int
+            If greater than 0, only this number of the latest records is kept in memory and written
+            to the file when an error is logged or a dump is requested, see dump_debug_records.
         """
         if not self._debug_file_handler:
-            self._debug_file_handler = logging.FileHandler(path, mode='a')
-        self._debug_file_handler.setFormatter(logging.Formatter(DEBUG_FORMAT, DATE_FORMAT))
+            self._debug_file_handler = self._file_handler_for(path, mode)
+            if recorder_capacity > 0:
+                from template_package.lib.log_handlers import FlightRecorderHandler
+                self._debug_file_handler = FlightRecorderHandler(recorder_capacity, self._debug_file_handler)
+        self._debug_file_handler.setFormatter(self._formatter(DEBUG_FORMAT))
         self._debug_file_handler.setLevel(logging.DEBUG)
         self._log.addHandler(self._debug_file_handler)
 
+    def buffer_records(self):
+        """Keeps logged records until the log file handlers are set up, see flush_buffered_records.
+        """
+        if not self._buffering_handler:
+            self._buffering_handler = _BufferingHandler()
+            self._log.addHandler(self._buffering_handler)
+
+    def flush_buffered_records(self):
+        """Passes the records kept so far to the log file handlers and stops keeping them.
+        """
+        if not self._buffering_handler:
+            return
+        self._log.removeHandler(self._buffering_handler)
+        records, self._buffering_handler = self._buffering_handler.records, None
+        for record in records:
+            for handler in [h for h in [self._file_handler, self._debug_file_handler] if h is not None]:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def dump_debug_records(self):
+        """Writes the debug records kept in memory to the debug log file, if they are kept.
+        """
+        dump = getattr(self._debug_file_handler, 'dump', None)
+        if dump is not None:
+            dump()
+
+    def dump_debug_records_on_signal(self):
+        """Writes the debug records kept in memory when the process receives SIGUSR1.
+        Nothing is done if the signal isn't available or is already handled by the script.
+        """
+        import signal
+        import threading
+        signum = getattr(signal, 'SIGUSR1', None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return
+        if signal.getsignal(signum) is signal.SIG_DFL:
+            signal.signal(signum, lambda signum, frame: self.dump_debug_records())
+
+    def enable_async(self, queue_size: int = 10000, policy: str = 'block'):
+        """Moves configured handlers behind a bounded queue served by a background listener thread.
+
+        Logging calls only enqueue the records, formatting and writing is done by the listener.
+
+        Parameters
+        ----------
+        queue_size: int
+            A maximum number of records waiting in the queue.
+        policy: str
+            A policy applied when the queue is full: block, drop-new or drop-old.
+        """
+        if self._queue_listener:
+            return
+        import queue
+        from template_package.lib.log_queue import BlockingQueueListener, BoundedQueueHandler
+        handlers = self._handlers()
+        log_queue = queue.Queue(maxsize=queue_size)
+        self._queue_handler = BoundedQueueHandler(log_queue, policy)
+        self._queue_handler.setLevel(min(h.level for h in handlers))
+        self._queue_listener = BlockingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            self._log.removeHandler(handler)
+        self._log.addHandler(self._queue_handler)
+        self._queue_listener.start()
+        atexit.register(self.disable_async)
+
+    def disable_async(self):
+        """Flushes queued records and moves the handlers back onto the root logger.
+        """
+        if not self._queue_listener:
+            return
+        self._log.removeHandler(self._queue_handler)
+        self._queue_listener.stop()
+        for handler in self._handlers():
+            self._log.addHandler(handler)
+        dropped = self._queue_handler.dropped
+        self._queue_listener = None
+        self._queue_handler = None
+        atexit.unregister(self.disable_async)
+        if dropped:
+            logging.warning('%s log records were dropped due to full logging queue.', dropped)
+
+    def enable_metrics(self, registry):
+        """Counts logged records by level and bytes written to the log files.
+
+        Parameters
+        ----------
+        registry: MetricsRegistry
+            A registry the metrics are kept in.
+        """
+        if self._metrics_handler:
+            return
+        self._metrics_handler = _RecordCountingHandler(
+            registry.counter('log_records_total', 'Log records by level.', ('level',)))
+        self._log.addHandler(self._metrics_handler)
+        written = registry.counter('log_bytes_written_total', 'Bytes written to log files.', ('file',))
+        for handler in [h for h in [self._file_handler, self._debug_file_handler] if h is not None]:
+            handler = getattr(handler, 'target', handler)
+            counter = written.labels(os.path.basename(handler.baseFilename))
+            # Streams opened later, e.g. after rotation, are counted as well.
+            handler._open = lambda open_stream=handler._open, counter=counter: _CountingStream(open_stream(), counter)
+            if handler.stream is not None:
+                handler.stream = _CountingStream(handler.stream, counter)
+
+    def close_on_termination(self):
+        """Closes the handlers, writing buffered records, when the process receives SIGTERM,
+        which terminates it afterwards as before. Nothing is done if SIGTERM is already handled by the script.
+        """
+        import signal
+        import threading
+        if threading.current_thread() is not threading.main_thread():
+            return
+        if signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL:
+            return
+
+        def terminate(signum, frame):
+            self.close()
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+        signal.signal(signal.SIGTERM, terminate)
+
+    def close(self, dump_debug_records: bool = False):
+        """Flushes pending records and closes configured handlers.
+
+        Parameters
+        ----------
+        dump_debug_records: bool
+            True if the debug records kept in memory should be written before, e.g. when the run failed.
+        """
+        self.disable_async()
+        self.flush_buffered_records()
+        if dump_debug_records:
+            self.dump_debug_records()
+        if self._metrics_handler:
+            self._log.removeHandler(self._metrics_handler)
+            self._metrics_handler = None
+        for handler in self._handlers():
+            self._log.removeHandler(handler)
+            handler.close()
+        self._stdout_handler = None
+        self._file_handler = None
+        self._debug_file_handler = None
+
     @staticmethod
     def set_hidden_password_formatter(password: str):
         """Sets up formatter for logging handlers to hide password.
@@ -134,6 +508,15 @@ class Logger:
         password: str
             A password string which have to be hidden in the log.
         """
-        for handler in logging.root.handlers:
-            handler.setFormatter(_HiddenSensitiveDataFormatterProxy(formatter=handler.formatter,
-                                                                    sensitive_patterns=[password]))
+        sensitive_data.add_literal(password)
+
+    @staticmethod
+    def set_hidden_pattern(pattern: str):
+        """Sets up formatter for logging handlers to hide data matching a regex pattern.
+
+        Parameters
+        ----------
+        pattern: str
+            A regex pattern matching data which have to be hidden in the log.
+        """
+        sensitive_data.add_pattern(pattern)
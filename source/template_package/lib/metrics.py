@@ -0,0 +1,306 @@
+"""Metrics registry implementation.
+
+Counters, gauges and histograms exported in Prometheus text format, e.g. for node-exporter textfile collector.
+Counters and histograms keep a separate cell per thread, so updating them doesn't take any lock;
+the cells are summed when the metrics are exported. A cell of a finished thread is added to a total
+kept for all finished threads, so short-lived threads, e.g. of worker pools, don't add up in memory.
+"""
+
+import bisect
+import os
+import threading
+import weakref
+
+from template_package.config.constants import SCRIPT_NAME_FORMATTED
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _ThreadToken:
+    """An object kept in thread-local data, which is released when the thread finishes.
+    """
+
+    __slots__ = ('__weakref__',)
+
+
+class _Cells:
+    """Per-thread cells of a value made of a fixed number of numbers.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        # Cells of running threads keyed by their id and the sum of cells of finished ones.
+        self._cells = {}
+        self._finished = [0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> list:
+        """Returns the cell of the current thread, creating it on the first use.
+        """
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = [0] * self._size
+            token = self._local.token = _ThreadToken()
+            with self._lock:
+                self._cells[id(cell)] = cell
+            weakref.finalize(token, self._finish, cell).atexit = False
+            return cell
+
+    def _finish(self, cell: list):
+        """Adds the cell of a finished thread to the total of finished threads.
+        """
+        with self._lock:
+            del self._cells[id(cell)]
+            for i, value in enumerate(cell):
+                self._finished[i] += value
+
+    def sum(self) -> list:
+        """Returns the value summed over all threads.
+        """
+        with self._lock:
+            cells = list(self._cells.values())
+            finished = list(self._finished)
+        return [finished[i] + sum(cell[i] for cell in cells) for i in range(self._size)]
+
+
+class _CounterValue:
+
+    __slots__ = ('_cells',)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1):
+        """Increases the counter.
+        """
+        self._cells.cell()[0] += amount
+
+    def samples(self, name: str, labels: str):
+        yield name, labels, self._cells.sum()[0]
+
+
+class _GaugeValue:
+
+    __slots__ = ('_value',)
+
+    def __init__(self):
+        self._value = 0
+
+    def set(self, value: float):
+        """Sets the gauge.
+        """
+        self._value = value
+
+    def samples(self, name: str, labels: str):
+        yield name, labels, self._value
+
+
+class _HistogramValue:
+
+    __slots__ = ('_buckets', '_cells')
+
+    def __init__(self, buckets: tuple):
+        self._buckets = buckets
+        # Counts of observations per bucket (the last one is +Inf), their sum and count.
+        self._cells = _Cells(len(buckets) + 3)
+
+    def observe(self, value: float):
+        """Records an observed value.
+        """
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self._buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def samples(self, name: str, labels: str):
+        values = self._cells.sum()
+        cumulative = 0
+        for bound, count in zip(self._buckets + ('+Inf',), values):
+            cumulative += count
+            le = f'le="{bound}"'
+            yield f"{name}_bucket", f"{labels},{le}" if labels else le, cumulative
+        yield f"{name}_sum", labels, values[-2]
+        yield f"{name}_count", labels, values[-1]
+
+
+class Metric:
+    """A metric family: values of the metric for all combinations of its label values.
+
+    Keyword arguments
+    -----------------
+    name: str
+        A name of the metric.
+    documentation: str
+        A description of the metric.
+    kind: str
+        A type of the metric: counter, gauge or histogram.
+    labelnames: tuple
+        Names of the metric labels.
+    buckets: tuple
+        Upper bounds of histogram buckets.
+    """
+
+    _value_classes = {'counter': _CounterValue, 'gauge': _GaugeValue}
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: tuple = (),
+                 buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self._labelnames = tuple(labelnames)
+        self._buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+        self._default = None if self._labelnames else self.labels()
+
+    def _new_value(self):
+        if self.kind == 'histogram':
+            return _HistogramValue(self._buckets)
+        return self._value_classes[self.kind]()
+
+    def labels(self, *values):
+        """Returns the value of the metric for given label values.
+        """
+        try:
+            return self._values[values]
+        except KeyError:
+            if len(values) != len(self._labelnames):
+                raise ValueError(f"{self.name} metric takes labels {self._labelnames}, {values} were given") from None
+            with self._lock:
+                return self._values.setdefault(values, self._new_value())
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def render(self) -> str:
+        """Returns the metric in Prometheus text format.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, value in list(self._values.items()):
+            labels = ','.join(f'{name}="{_escape(label)}"' for name, label in zip(self._labelnames, values))
+            for name, sample_labels, sample in value.samples(self.name, labels):
+                lines.append(f"{name}{{{sample_labels}}} {sample}" if sample_labels else f"{name} {sample}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """Class handles metrics of the script.
+
+    Keyword arguments
+    -----------------
+    prefix: str
+        A prefix added to names of all metrics.
+    """
+
+    def __init__(self, prefix: str = ''):
+        self._prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, name: str, documentation: str, kind: str, labelnames: tuple, **kwargs) -> Metric:
+        name = self._prefix + name
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, Metric(name, documentation, kind, labelnames, **kwargs))
+        if metric.kind != kind:
+            raise ValueError(f"{name} metric is already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Metric:
+        """Returns a counter of given name, registering it on the first call.
+        """
+        return self._metric(name, documentation, 'counter', labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Metric:
+        """Returns a gauge of given name, registering it on the first call.
+        """
+        return self._metric(name, documentation, 'gauge', labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Metric:
+        """Returns a histogram of given name, registering it on the first call.
+        """
+        return self._metric(name, documentation, 'histogram', labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Returns all metrics in Prometheus text format.
+        """
+        return ''.join(metric.render() for metric in list(self._metrics.values()))
+
+    def write(self, path: os.PathLike):
+        """Writes all metrics to a file atomically: readers see either the previous or the new content.
+
+        Parameters
+        ----------
+        path: os.PathLike
+            A path of the file, typically with .prom extension.
+        """
+        path = os.fspath(path)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'w') as file:
+            file.write(self.render())
+        os.replace(temporary_path, path)
+
+
+class MetricsWriter:
+    """Writes metrics to a file periodically from a background thread and once more when stopped.
+
+    Keyword arguments
+    -----------------
+    registry: MetricsRegistry
+        Metrics to be written.
+    path: os.PathLike
+        A path of the file.
+    interval: float
+        A number of seconds between writes, 0 means writing only when stopped.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: os.PathLike, interval: float = 15):
+        self._registry = registry
+        self._path = path
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self._write()
+
+    def _write(self):
+        try:
+            self._registry.write(self._path)
+        except OSError as exception:
+            import logging
+            logging.error('Metrics could not be written to %s: %s.', self._path, exception)
+
+    def start(self):
+        """Starts periodic writes.
+        """
+        if self._interval > 0:
+            self._thread = threading.Thread(target=self._run, name='MetricsWriter', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops periodic writes and writes the metrics for the last time.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._write()
+
+
+metrics = MetricsRegistry(f"{SCRIPT_NAME_FORMATTED}_")
@@ -0,0 +1,126 @@
+"""Profiler class implementation.
+
+Profiles CPU time with cProfile and memory allocations with tracemalloc.
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+
+class _ThreadStats:
+    """Holds statistics of a profiler running in another thread, so they can be read without disabling it.
+    """
+
+    def __init__(self, profiler: cProfile.Profile):
+        profiler.snapshot_stats()
+        self.stats = profiler.stats
+
+    def create_stats(self):
+        pass
+
+
+class Profiler:
+    """Class handles profiling of the script run.
+
+    CPU profiling covers the thread which starts the profiler and all threads started afterwards,
+    work done in worker processes isn't included.
+
+    Keyword arguments
+    -----------------
+    kind: str
+        What is profiled: cpu, mem or both.
+    path: os.PathLike
+        A path of the log file, the results are written next to it.
+    top: int
+        A number of entries listed in the summary and in the allocations snapshot.
+    """
+
+    def __init__(self, kind: str, path: os.PathLike, top: int = 25):
+        self._cpu = kind in ('cpu', 'both')
+        self._mem = kind in ('mem', 'both')
+        self._path = Path(path)
+        self._top = top
+        self._profiler = None
+        self._thread_profilers = []
+        self._start_time = None
+
+    def _profile_thread(self, frame, event, arg):
+        """Enables a separate profiler in a newly started thread, called on the first event in the thread.
+        """
+        profiler = cProfile.Profile()
+        self._thread_profilers.append(profiler)
+        profiler.enable()
+
+    def start(self):
+        """Starts profiling.
+        """
+        self._start_time = time.perf_counter()
+        if self._mem:
+            tracemalloc.start()
+        if self._cpu:
+            self._profiler = cProfile.Profile()
+            # Since Python 3.12 the profiler covers all threads, before it a separate one is enabled in every new thread.
+            if sys.version_info < (3, 12):
+                threading.setprofile(self._profile_thread)
+            self._profiler.enable()
+
+    def _result_path(self, suffix: str) -> Path:
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        return self._path.with_name(f"{self._path.stem}_profile_{timestamp}_{os.getpid()}{suffix}")
+
+    def stop(self) -> list:
+        """Stops profiling, writes the results and logs their summary.
+
+        Returns
+        -------
+        list
+            Paths of the written files.
+        """
+        paths = []
+        elapsed = time.perf_counter() - self._start_time
+        if self._cpu:
+            self._profiler.disable()
+            threading.setprofile(None)
+            # Python before 3.12 removes a profiler from a thread still running only if the thread disables it,
+            # the profilers are marked as disabled and their results are taken now.
+            for profiler in self._thread_profilers:
+                profiler.disable()
+        if self._mem:
+            # Allocations made by the profilers themselves are left out.
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, cProfile.__file__),
+                                                                  tracemalloc.Filter(False, tracemalloc.__file__)])
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if self._cpu:
+            stats = pstats.Stats(self._profiler)
+            for profiler in self._thread_profilers:
+                stats.add(_ThreadStats(profiler))
+            paths.append(self._result_path('.pstats'))
+            stats.dump_stats(paths[-1])
+            logging.info('CPU profile of %.3fs run (%s function calls) written to %s. Top functions by '
+                         'cumulative time:\n%s', elapsed, stats.total_calls, paths[-1], self._top_functions(stats))
+        if self._mem:
+            statistics = snapshot.statistics('lineno')[:self._top]
+            paths.append(self._result_path('_memory.txt'))
+            with open(paths[-1], 'w') as file:
+                file.write(f"Traced memory: current {current} B, peak {peak} B.\n")
+                file.write('\n'.join(str(statistic) for statistic in statistics) + '\n')
+            logging.info('Memory profile written to %s. Traced memory: current %.1f KiB, peak %.1f KiB. '
+                         'Top allocations:\n%s', paths[-1], current / 1024, peak / 1024,
+                         '\n'.join(str(statistic) for statistic in statistics[:5]))
+        return paths
+
+    @staticmethod
+    def _top_functions(stats: pstats.Stats, count: int = 5) -> str:
+        """Returns a short listing of the functions with the longest cumulative time.
+        """
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:count]
+        return '\n'.join(f"{cumulative:10.4f}s {calls:>8} {pstats.func_std_string(function)}"
+                         for function, (_, calls, _, cumulative, _) in entries)
@@ -0,0 +1,106 @@
+"""SensitiveDataRegistry class implementation.
+"""
+
+import re
+import threading
+
+
+class SensitiveDataRegistry:
+    """A registry of sensitive data which should never appear in the log.
+
+    Literals and regex patterns can be added at any time. All of them are compiled
+    into a single matcher, so a text is scanned once no matter how many entries are registered.
+
+    Keyword arguments
+    -----------------
+    mask: str
+        A string put in place of each sensitive phrase.
+    """
+
+    def __init__(self, mask: str = '*' * 5):
+        self._mask = mask
+        self._literals = {}
+        self._patterns = {}
+        self._matcher = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._literals) + len(self._patterns)
+
+    def add_literal(self, literal: str):
+        """Registers a phrase which is hidden as is, regex special signs have no meaning here.
+
+        Parameters
+        ----------
+        literal: str
+            A sensitive phrase, e.g. a password.
+        """
+        if not literal:
+            return
+        with self._lock:
+            if literal not in self._literals:
+                self._literals[literal] = None
+                self._compile()
+
+    def add_pattern(self, pattern: str):
+        """Registers a regex pattern matching sensitive data.
+
+        Parameters
+        ----------
+        pattern: str
+            A regex pattern. Numbered backreferences and global inline flags, e.g. "(?i)", are not supported
+            as the patterns are combined, flags are set for a group instead, e.g. "(?i:token)=\\w+".
+
+        Raises
+        ------
+        re.error
+            If the pattern is not a valid regular expression or can't be combined with registered ones.
+            The pattern isn't registered then.
+        """
+        re.compile(pattern)
+        with self._lock:
+            if pattern not in self._patterns:
+                self._patterns[pattern] = None
+                try:
+                    self._compile()
+                except re.error:
+                    del self._patterns[pattern]
+                    raise
+
+    def clear(self):
+        """Removes all registered entries.
+        """
+        with self._lock:
+            self._literals.clear()
+            self._patterns.clear()
+            self._matcher = None
+
+    def _compile(self):
+        """Compiles all registered entries into one matcher. Longer literals go first,
+        so a literal being a part of another one doesn't leave the rest of the longer one visible.
+        The former matcher is kept if the entries can't be compiled.
+        """
+        alternatives = [re.escape(literal) for literal in sorted(self._literals, key=len, reverse=True)]
+        alternatives.extend(f"(?:{pattern})" for pattern in self._patterns)
+        self._matcher = re.compile('|'.join(alternatives))
+
+    def redact(self, text: str) -> str:
+        """Hides all registered sensitive data found in given text.
+
+        Parameters
+        ----------
+        text: str
+            A text to be searched.
+
+        Returns
+        -------
+        str
+            The text with sensitive data replaced by the mask.
+        """
+        matcher = self._matcher
+        if matcher is None:
+            return text
+        return matcher.sub(self._mask, text)
+
+
+sensitive_data = SensitiveDataRegistry()
@@ -0,0 +1,153 @@
+"""Tracer class implementation.
+
+Measures spans of the script run and exports them as Chrome trace events, viewable in chrome://tracing
+or Perfetto. Spans are used as context managers, "with span('name'):", or decorators, "@traced('name')".
+While tracing is disabled a span is a shared object doing nothing.
+"""
+
+import functools
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """A span used while tracing is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A span recorded as a complete trace event when it ends.
+    """
+
+    __slots__ = ('_tracer', '_name', '_args', '_start')
+
+    def __init__(self, tracer, name: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._args['error'] = exc_type.__name__
+        self._tracer._add(self._name, self._start, time.perf_counter_ns(), self._args)
+        return False
+
+
+class Tracer:
+    """Class handles collecting of spans.
+
+    Keyword arguments
+    -----------------
+    max_events: int
+        A maximum number of kept spans, further ones are counted as dropped.
+    """
+
+    def __init__(self, max_events: int = 1000000):
+        self.enabled = False
+        self.dropped = 0
+        self._max_events = max_events
+        self._events = []
+        self._thread_names = {}
+
+    def enable(self):
+        """Starts collecting spans.
+        """
+        self.enabled = True
+
+    def disable(self):
+        """Stops collecting spans, the collected ones are kept.
+        """
+        self.enabled = False
+
+    def clear(self):
+        """Forgets collected spans.
+        """
+        self._events = []
+        self._thread_names = {}
+        self.dropped = 0
+
+    def span(self, name: str, **args):
+        """Returns a context manager measuring a span.
+
+        Parameters
+        ----------
+        name: str
+            A name of the span, e.g. "config.parse".
+        args: dict
+            Values shown together with the span in the trace viewer.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def traced(self, name: str = None):
+        """Returns a decorator measuring calls of a function as spans, named after the function by default.
+        """
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Span(self, span_name, {}):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _add(self, name: str, start: int, end: int, args: dict):
+        if len(self._events) >= self._max_events:
+            self.dropped += 1
+            return
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        self._events.append((name, start, end, thread.ident, args))
+
+    def summary(self) -> dict:
+        """Returns a number of spans and their total duration in seconds, keyed by span name.
+        """
+        summary = {}
+        for name, start, end, _, _ in self._events:
+            count, total = summary.get(name, (0, 0.0))
+            summary[name] = (count + 1, total + (end - start) / 1e9)
+        return summary
+
+    def write(self, path: os.PathLike):
+        """Writes collected spans as a Chrome trace events JSON file.
+
+        Parameters
+        ----------
+        path: os.PathLike
+            A path of the file.
+        """
+        import json
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+                  for tid, thread_name in self._thread_names.items()]
+        events.extend({'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'ts': start / 1000,
+                       'dur': (end - start) / 1000, 'pid': pid, 'tid': tid, 'args': args}
+                      for name, start, end, tid, args in self._events)
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file, default=str)
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
@@ -0,0 +1,160 @@
+"""Script modes implementation.
+
+A module implementing a mode is imported only when the mode is run. A mode splits its work into units
+and passes them to run_units, which processes them with the workers set in the script arguments.
+A mode can also provide run_async coroutine, used by the asyncio entry point.
+"""
+
+import importlib
+import logging
+
+from template_package.config.mode import Mode
+from template_package.config.script_exit_code import ScriptExitCode
+from template_package.lib.exit_code import ExitCode
+from template_package.lib.metrics import metrics
+from template_package.lib.tracing import span
+
+_mode_modules = {Mode.MODE_A: 'template_package.modes.mode_a',
+                 Mode.MODE_B: 'template_package.modes.mode_b'}
+
+
+def run_mode(args) -> ExitCode:
+    """Runs the mode chosen in the script arguments.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    ExitCode
+        The script exit code.
+    """
+    module = _mode_module(args)
+    if module is None:
+        return ScriptExitCode.SOME_OTHER_ERROR
+    with span('mode.run', mode=args.mode):
+        return module.run(args)
+
+
+async def run_mode_async(args) -> ExitCode:
+    """Runs the mode chosen in the script arguments in the running event loop.
+    A mode without run_async coroutine is run in a separate thread.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    ExitCode
+        The script exit code.
+    """
+    module = _mode_module(args)
+    if module is None:
+        return ScriptExitCode.SOME_OTHER_ERROR
+    with span('mode.run', mode=args.mode):
+        if hasattr(module, 'run_async'):
+            return await module.run_async(args)
+        import asyncio
+        return await asyncio.to_thread(module.run, args)
+
+
+def _mode_module(args):
+    """Imports the module of the mode chosen in the script arguments, returns None if no valid mode is chosen.
+    """
+    mode = args.get(Mode.dest)
+    if mode not in _mode_modules:
+        logging.error('Script mode has to be chosen, possible modes: %s.', ', '.join(_mode_modules))
+        return None
+    return importlib.import_module(_mode_modules[mode])
+
+
+def _unit_exit_code(unit, result, exception) -> ExitCode:
+    """Returns the exit code of a processed work unit.
+    """
+    units = metrics.counter('work_units_total', 'Processed work units by exit code.', ('code',))
+    if exception is not None:
+        logging.error('Processing of work unit %s failed: %s.', unit, exception, exc_info=exception)
+        units.labels(ScriptExitCode.WORKER_ERROR.code).inc()
+        return ScriptExitCode.WORKER_ERROR
+    units.labels(result.code).inc()
+    # Exit codes coming from worker processes are copies, they are matched by the code.
+    return ScriptExitCode.from_code(result.code)
+
+
+def run_units(args, function, units) -> ExitCode:
+    """Processes work units of a mode with the workers and the executor set in the script arguments.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+    function: Callable
+        A module level function processing a single unit and returning an ExitCode.
+    units: Iterable
+        Work units, taken lazily.
+
+    Returns
+    -------
+    ExitCode
+        OK if all units were processed successfully, WORKER_ERROR if processing of a unit raised an exception,
+        otherwise the exit code of the first failed unit.
+    """
+    if args.executor == 'asyncio':
+        import asyncio
+        return asyncio.run(run_units_async(args, function, units))
+    from template_package.lib.executor import map_ordered
+    exit_code = ScriptExitCode.OK
+    processed = 0
+    with span('mode.units', workers=args.workers, executor=args.executor):
+        for unit, result, exception in map_ordered(function, units, args.workers, args.executor):
+            processed += 1
+            result = _unit_exit_code(unit, result, exception)
+            if result is not ScriptExitCode.OK and exit_code is ScriptExitCode.OK:
+                exit_code = result
+    logging.info('Processed %s work units with %s %s worker(s).', processed, args.workers, args.executor)
+    return exit_code
+
+
+async def run_units_async(args, function, units, coroutine_function=None) -> ExitCode:
+    """Processes work units of a mode without blocking the event loop.
+
+    With asyncio executor the units are processed by coroutine_function, or by function run in threads
+    if it isn't given. Other executors process them by function in a separate thread, see run_units.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+    function: Callable
+        A module level function processing a single unit and returning an ExitCode.
+    units: Iterable
+        Work units, taken lazily.
+    coroutine_function: Callable
+        A coroutine function processing a single unit and returning an ExitCode.
+
+    Returns
+    -------
+    ExitCode
+        The same as returned by run_units.
+    """
+    import asyncio
+    if args.executor != 'asyncio':
+        return await asyncio.to_thread(run_units, args, function, units)
+    from template_package.lib.executor import map_ordered_async
+    if coroutine_function is None:
+        def coroutine_function(unit):
+            return asyncio.to_thread(function, unit)
+    exit_code = ScriptExitCode.OK
+    processed = 0
+    with span('mode.units', workers=args.workers, executor=args.executor):
+        async for unit, result, exception in map_ordered_async(coroutine_function, units, args.workers):
+            processed += 1
+            result = _unit_exit_code(unit, result, exception)
+            if result is not ScriptExitCode.OK and exit_code is ScriptExitCode.OK:
+                exit_code = result
+    logging.info('Processed %s work units with %s concurrent asyncio tasks at most.', processed, args.workers)
+    return exit_code
@@ -0,0 +1,103 @@
+"""Work common for all script modes.
+"""
+
+import asyncio
+import logging
+
+from template_package.config.arg_file import StreamValues
+from template_package.config.common_args import CommonIntParam, CommonListParam
+from template_package.config.script_exit_code import ScriptExitCode
+from template_package.lib.exit_code import ExitCode
+from template_package.lib.tracing import traced
+
+
+def run_common(args):
+    """Handles parameters common for all script modes.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+    """
+    logging.info('Parameter provided as command line argument: log_level=%s.', args.log_level)
+    logging.info('Parameter provided as command line argument: basic_param=%s.', args.basic_param)
+    # Optional arguments which haven't been provided are read as None.
+    logging.info('Parameter provided as command line argument: common_int_param=%s.',
+                 args.get(CommonIntParam.dest))
+    args.common_int_param = 45
+    logging.info('A new value of "common_int_param" argument is "%s"', args.common_int_param)
+    logging.info('Is common_int_param also a integer? - %s!', isinstance(args.common_int_param, int))
+    logging.info('Parameter provided as command line argument: common_list_param=%s.',
+                 args.get(CommonListParam.dest))
+    if args.get(CommonListParam.dest) is None:
+        logging.info('The list hasn\'t been provided, there is nothing to process.')
+        return
+    if isinstance(args.common_list_param, StreamValues):
+        # Streamed values can be read only once, they're left for the work units.
+        logging.info('Elements of the list are streamed, they are processed as they are read.')
+        return
+    logging.info('The last element of the list: %s.', args.common_list_param[-1])
+    if CommonListParam.element_type is not None:
+        # A compact array keeps only elements of its type.
+        logging.info('Elements of the list are kept in a compact array of %s type.', CommonListParam.element_type)
+        return
+    append_element = 'last'
+    logging.info('Appending "%s" to the list...', append_element)
+    args.common_list_param.append(append_element)
+    logging.info('Subsequent elements of the list:')
+    for i, j in enumerate(args.common_list_param):
+        print(i, j)
+
+
+def work_units(args):
+    """Splits work common for all script modes into units: subsequent elements of the list parameter.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    Iterable
+        Tuples of an element index and the element, none if the list parameter hasn't been provided.
+    """
+    values = args.get(CommonListParam.dest)
+    return enumerate(values if values is not None else ())
+
+
+@traced('mode.unit')
+def process_unit(unit) -> ExitCode:
+    """Processes a single unit of work common for all script modes.
+
+    Parameters
+    ----------
+    unit: tuple
+        An element index and the element.
+
+    Returns
+    -------
+    ExitCode
+        The unit exit code.
+    """
+    index, element = unit
+    logging.info('Processing element %s of the list: %s.', index, element)
+    return ScriptExitCode.OK
+
+
+async def process_unit_async(unit) -> ExitCode:
+    """Processes a single unit of work common for all script modes as a coroutine.
+
+    Parameters
+    ----------
+    unit: tuple
+        An element index and the element.
+
+    Returns
+    -------
+    ExitCode
+        The unit exit code.
+    """
+    # Stands for awaiting an I/O operation.
+    await asyncio.sleep(0)
+    return process_unit(unit)
@@ -0,0 +1,52 @@
+"""Mode A implementation.
+"""
+
+import logging
+
+from template_package.config.mode_a_args import AModeOnlyParam
+from template_package.lib.exit_code import ExitCode
+from template_package.modes import run_units, run_units_async
+from template_package.modes.common import process_unit, process_unit_async, run_common, work_units
+
+
+def _handle_params(args):
+    """Handles A-mode parameters.
+    """
+    run_common(args)
+    a_mode_param = args.get(AModeOnlyParam.dest)
+    logging.info('Parameter provided as command line argument: a_mode_param=%s.', a_mode_param)
+    logging.info('Is a_mode_param also a string? - %s!', isinstance(a_mode_param, str))
+
+
+def run(args) -> ExitCode:
+    """Runs A-mode.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    ExitCode
+        The script exit code.
+    """
+    _handle_params(args)
+    return run_units(args, process_unit, work_units(args))
+
+
+async def run_async(args) -> ExitCode:
+    """Runs A-mode in the running event loop.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    ExitCode
+        The script exit code.
+    """
+    _handle_params(args)
+    return await run_units_async(args, process_unit, work_units(args), process_unit_async)
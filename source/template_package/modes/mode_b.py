@@ -0,0 +1,40 @@
+"""Mode B implementation.
+"""
+
+from template_package.lib.exit_code import ExitCode
+from template_package.modes import run_units, run_units_async
+from template_package.modes.common import process_unit, process_unit_async, run_common, work_units
+
+
+def run(args) -> ExitCode:
+    """Runs B-mode.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    ExitCode
+        The script exit code.
+    """
+    run_common(args)
+    return run_units(args, process_unit, work_units(args))
+
+
+async def run_async(args) -> ExitCode:
+    """Runs B-mode in the running event loop.
+
+    Parameters
+    ----------
+    args: Args
+        The script arguments.
+
+    Returns
+    -------
+    ExitCode
+        The script exit code.
+    """
+    run_common(args)
+    return await run_units_async(args, process_unit, work_units(args), process_unit_async)
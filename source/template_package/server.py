@@ -0,0 +1,173 @@
+"""Warm-start server implementation.
+
+The server keeps the package imported and pre-forks workers waiting for requests on a Unix socket.
+A request carries an argument vector together with the client's working directory, environment
+and standard streams. Each request is run by one worker which exits afterwards, so runs never share
+state, and the server forks a new pre-initialised worker in its place.
+
+Usage: python -m template_package.server [--socket PATH] [--workers N]
+"""
+
+import logging
+import marshal
+import os
+import signal
+import socket
+import sys
+
+from template_package.client import EXIT_CODE, HEADER, SOCKET_ENV_NAME, default_socket_path, private_directory
+
+_STREAMS = 3
+
+_log = logging.getLogger(__name__)
+
+
+def _receive_request(connection: socket.socket):
+    """Receives a request, returns its content and the client's standard streams descriptors.
+    """
+    data, fds, _, _ = socket.recv_fds(connection, 65536, _STREAMS)
+    while len(data) < HEADER.size:
+        chunk = connection.recv(65536)
+        if not chunk:
+            raise ConnectionError('the client closed the connection before sending the request')
+        data += chunk
+    size = HEADER.unpack_from(data)[0]
+    while len(data) < HEADER.size + size:
+        chunk = connection.recv(65536)
+        if not chunk:
+            raise ConnectionError('the client closed the connection before sending the request')
+        data += chunk
+    return marshal.loads(data[HEADER.size:HEADER.size + size]), fds
+
+
+def _warm_up():
+    """Imports and compiles everything a run needs, before workers are forked.
+    Nothing depending on the working directory (e.g. log-file paths) is touched here.
+    """
+    import importlib
+    from template_package.__main__ import main
+    from template_package.config.command_line_parser import CommandLineParser
+    from template_package.modes import _mode_modules
+    CommandLineParser._get_fast_parser()
+    for module in ['argparse', 'asyncio', 'pathlib', 'template_package.config.config', *_mode_modules.values()]:
+        importlib.import_module(module)
+    return main
+
+
+def _run_worker(listener: socket.socket, main) -> int:
+    """Serves a single request in a forked worker process and returns the process exit code.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    connection, _ = listener.accept()
+    listener.close()
+    with connection:
+        request, fds = _receive_request(connection)
+        for stream_fd, fd in enumerate(fds):
+            os.dup2(fd, stream_fd)
+            os.close(fd)
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        sys.argv = request['argv']
+        try:
+            exit_code = main(sys.argv[1:])
+        except SystemExit as exception:
+            exit_code = exception.code if isinstance(exception.code, int) else (0 if exception.code is None else 1)
+        except BaseException:
+            import traceback
+            from template_package.config.script_exit_code import ScriptExitCode
+            traceback.print_exc()
+            exit_code = ScriptExitCode.INTERNAL_ERROR.code
+        sys.stdout.flush()
+        sys.stderr.flush()
+        connection.sendall(EXIT_CODE.pack(exit_code))
+    return 0
+
+
+def _fork_worker(listener: socket.socket, main) -> int:
+    """Forks a worker, returns its process id.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            status = _run_worker(listener, main)
+        finally:
+            os._exit(status)
+    return pid
+
+
+def serve(socket_path: str = None, workers: int = 4):
+    """Runs the server until it gets SIGTERM or SIGINT.
+
+    Parameters
+    ----------
+    socket_path: str
+        A path of the Unix socket to listen on.
+    workers: int
+        A number of pre-forked workers waiting for requests.
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+        if not os.environ.get(SOCKET_ENV_NAME) and not os.environ.get('XDG_RUNTIME_DIR'):
+            private_directory(os.path.dirname(socket_path))
+    main = _warm_up()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    listener.listen(max(workers, 16))
+    pids = set()
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    _log.info('Listening on %s with %s workers.', socket_path, workers)
+    try:
+        while True:
+            while len(pids) < workers:
+                pids.add(_fork_worker(listener, main))
+            pid, status = os.wait()
+            pids.discard(pid)
+            if os.waitstatus_to_exitcode(status) != 0:
+                _log.warning('Worker %s exited with status %s.', pid, os.waitstatus_to_exitcode(status))
+    except KeyboardInterrupt:
+        _log.info('Stopping the server.')
+    finally:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        listener.close()
+        os.unlink(socket_path)
+
+
+def _main():
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m template_package.server',
+                                     description='Runs a warm-start server of the script.')
+    parser.add_argument('--socket',
+                        help=f'A path of the Unix socket, {SOCKET_ENV_NAME} environment variable or a file\n'
+                             f'in XDG_RUNTIME_DIR or in a private directory of the temporary directory by default.')
+    parser.add_argument('--workers', type=int, default=4, help='A number of pre-forked workers.')
+    params = parser.parse_args()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-8s %(message)s'))
+    _log.addHandler(handler)
+    _log.setLevel(logging.INFO)
+    _log.propagate = False
+    serve(params.socket, params.workers)
+
+
+if __name__ == '__main__':
+    _main()